@@ -0,0 +1,290 @@
+"""
+Clique search over a CSRGraph with integer bitsets
+
+The graph is first put in degeneracy order (repeatedly remove a vertex of
+minimum degree). Every clique is then found exactly once, from its earliest
+vertex v, inside the small subproblem "v plus its later neighbours"; the
+subproblem's adjacency is a list of Python ints used as bitsets, so set
+operations are single big-int ANDs/ORs and the candidate set is bounded by
+the degeneracy rather than by n (maximal-clique enumeration also carries
+the earlier neighbours, as Bron-Kerbosch's excluded set X).
+
+- iter_maximal_cliques: Bron-Kerbosch with Tomita pivoting, as a generator
+  (stop whenever you like, or stream with write_maximal_cliques)
+- maximum_cliques / clique_number: branch and bound with greedy colouring
+  upper bounds (Tomita's MCQ), pruned by the best clique found so far
+
+Usage:
+    clique_number(g), cliques_maximum(g)          # like Sage's methods
+    for clique in iter_maximal_cliques(g): ...
+"""
+
+import numpy as np
+
+
+def simple_adjacency(g):
+    """(indptr, indices) without self-loops or parallel edges, rows sorted"""
+    if g.directed:
+        raise ValueError("clique search needs an undirected graph")
+    n = g.n
+    rows = g.slot_sources().astype(np.int64)
+    cols = g.indices.astype(np.int64)
+    keep = rows != cols
+    keys = np.unique(rows[keep] * n + cols[keep])
+    rows, cols = keys // n, keys % n
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+    return indptr, cols
+
+
+def degeneracy_order(indptr, indices):
+    """Vertex order of repeated minimum-degree removal, and the core number of each vertex"""
+    n = len(indptr) - 1
+    deg = np.diff(indptr).tolist()
+    indptr = indptr.tolist()
+    indices = indices.tolist()
+    max_deg = max(deg, default=0)
+
+    # Bucket sort by degree (Batagelj-Zaversnik)
+    start = [0] * (max_deg + 2)
+    for d in deg:
+        start[d + 1] += 1
+    for d in range(1, max_deg + 2):
+        start[d] += start[d - 1]
+    vert = [0] * n
+    pos = [0] * n
+    fill = start[:]
+    for v in range(n):
+        pos[v] = fill[deg[v]]
+        vert[pos[v]] = v
+        fill[deg[v]] += 1
+
+    for i in range(n):
+        v = vert[i]
+        for j in range(indptr[v], indptr[v + 1]):
+            u = indices[j]
+            du = deg[u]
+            if du > deg[v]:
+                # Move u to the front of its bucket, then into the bucket below
+                pw = start[du]
+                w = vert[pw]
+                if u != w:
+                    vert[pos[u]], vert[pw] = w, u
+                    pos[w], pos[u] = pos[u], pw
+                start[du] += 1
+                deg[u] = du - 1
+    return vert, deg
+
+
+def _bits(b):
+    while b:
+        low = b & -b
+        yield low.bit_length() - 1
+        b ^= low
+
+
+DENSE_BITSET_MAX = 2048     # above this many vertices, fill subproblem rows one at a time
+SMALL_SUBPROBLEM = 256      # out-list entries below which plain Python beats NumPy
+
+
+class _Degeneracy:
+    """
+    Degeneracy order plus the adjacency oriented along it: out[v] holds the
+    neighbours after v, so |out[v]| <= degeneracy and every edge is listed once.
+    """
+
+    def __init__(self, g):
+        self.indptr, self.indices = simple_adjacency(g)
+        self.order, self.core = degeneracy_order(self.indptr, self.indices)
+        self.rank = np.empty(g.n, dtype=np.int64)
+        self.rank[self.order] = np.arange(g.n)
+
+        rows = np.repeat(np.arange(g.n), np.diff(self.indptr))
+        forward = self.rank[self.indices] > self.rank[rows]
+        self.out_ptr = np.zeros(g.n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows[forward], minlength=g.n), out=self.out_ptr[1:])
+        self.out = self.indices[forward]
+        self._local = np.full(g.n, -1, dtype=np.int64)
+        # Python-side copies for the many tiny subproblems of a sparse graph
+        self._ptr = self.indptr.tolist()
+        self._adj = self.indices.tolist()
+        self._out_ptr = self.out_ptr.tolist()
+        self._out = self.out.tolist()
+        self._rank = self.rank.tolist()
+
+    def split(self, v):
+        """Neighbours of v after it and before it in the order"""
+        later = self._out[self._out_ptr[v]:self._out_ptr[v + 1]]
+        r = self._rank[v]
+        earlier = [u for u in self._adj[self._ptr[v]:self._ptr[v + 1]] if self._rank[u] < r]
+        return later, earlier
+
+    def bitsets(self, verts):
+        """Bitset adjacency among verts, walking only their out-lists"""
+        ptr, out = self._out_ptr, self._out
+        if sum(ptr[w + 1] - ptr[w] for w in verts) <= SMALL_SUBPROBLEM:
+            pos = {w: i for i, w in enumerate(verts)}
+            bits = [0] * len(verts)
+            for i, w in enumerate(verts):
+                for x in out[ptr[w]:ptr[w + 1]]:
+                    j = pos.get(x)
+                    if j is not None:
+                        bits[i] |= 1 << j
+                        bits[j] |= 1 << i
+            return bits
+        verts = np.asarray(verts, dtype=np.int64)
+        self._local[verts] = np.arange(len(verts))
+        bits = _local_bitsets(verts, self.out_ptr, self.out, self._local)
+        self._local[verts] = -1
+        return bits
+
+
+def _local_bitsets(vertices, indptr, indices, local):
+    """Symmetric bitset adjacency among `vertices` from oriented lists (local[vertices] holds 0..k-1)"""
+    k = len(vertices)
+    starts, ends = indptr[vertices], indptr[vertices + 1]
+    lens = ends - starts
+    slots = np.repeat(starts - np.cumsum(lens) + lens, lens) + np.arange(lens.sum())
+    owner = np.repeat(np.arange(k), lens)
+    idx = local[indices[slots]]
+    hit = idx >= 0
+    owner, idx = owner[hit], idx[hit]
+    if k <= DENSE_BITSET_MAX:
+        M = np.zeros((k, k), dtype=bool)
+        M[owner, idx] = True
+        M |= M.T
+        rows = np.packbits(M, axis=1, bitorder='little')
+        return [int.from_bytes(r.tobytes(), 'little') for r in rows]
+    bits = [0] * k
+    for i, j in zip(owner.tolist(), idx.tolist()):
+        bits[i] |= 1 << j
+        bits[j] |= 1 << i
+    return bits
+
+
+def _pivot_bk(R, P, X, adj, min_size):
+    if len(R) + 1 + P.bit_count() < min_size:
+        return
+    if not P:
+        if not X:
+            yield R
+        return
+    # Tomita pivot: the vertex of P|X with the most neighbours in P
+    pivot = max(_bits(P | X), key=lambda u: (P & adj[u]).bit_count())
+    for v in _bits(P & ~adj[pivot]):
+        yield from _pivot_bk(R + [v], P & adj[v], X & adj[v], adj, min_size)
+        P &= ~(1 << v)
+        X |= 1 << v
+
+
+def iter_maximal_cliques(g, min_size=1):
+    """Lazily yield every maximal clique (a list of vertex ids) of size >= min_size"""
+    dg = _Degeneracy(g)
+    for v in dg.order:
+        later, earlier = dg.split(v)
+        if len(later) + 1 < min_size:
+            continue
+        verts = later + earlier
+        adj = dg.bitsets(verts)
+        P = (1 << len(later)) - 1
+        X = ((1 << len(verts)) - 1) ^ P
+        for clique in _pivot_bk([], P, X, adj, min_size):
+            yield [v] + [verts[i] for i in clique]
+
+
+def write_maximal_cliques(g, path, min_size=1):
+    """Stream maximal cliques to a text file, one per line as comma-separated names; returns the count"""
+    count = 0
+    with open(path, 'w') as f:
+        for clique in iter_maximal_cliques(g, min_size):
+            f.write(','.join(str(g.names[v]) for v in clique) + '\n')
+            count += 1
+    return count
+
+
+def _colour_sort(P, adj):
+    """Greedy colouring of P; returns vertices and, for each, the number of colours used so far"""
+    order, bounds = [], []
+    colour = 0
+    while P:
+        colour += 1
+        Q = P
+        while Q:
+            low = Q & -Q
+            v = low.bit_length() - 1
+            P &= ~low
+            Q &= ~low & ~adj[v]
+            order.append(v)
+            bounds.append(colour)
+    return order, bounds
+
+
+class _MaxCliqueSearch:
+    """Branch and bound state; cliques are built as local ids below the subproblem root"""
+
+    def __init__(self, keep_all):
+        self.keep_all = keep_all
+        self.best_size = 0
+        self.best = []
+        self.root = None
+        self.verts = None
+
+    def _found(self, R):
+        size = len(R) + 1
+        if size > self.best_size:
+            self.best_size = size
+            self.best = []
+        if size == self.best_size and (self.keep_all or not self.best):
+            self.best.append([self.root] + [self.verts[i] for i in R])
+
+    def _pruned(self, size):
+        # With keep_all, ties still have to be explored
+        return size < self.best_size if self.keep_all else size <= self.best_size
+
+    def expand(self, R, P, adj):
+        order, bounds = _colour_sort(P, adj)
+        for i in range(len(order) - 1, -1, -1):
+            if self._pruned(len(R) + 1 + bounds[i]):
+                return
+            v = order[i]
+            newP = P & adj[v]
+            if newP:
+                self.expand(R + [v], newP, adj)
+            else:
+                self._found(R + [v])
+            P &= ~(1 << v)
+
+    def run(self, g):
+        dg = _Degeneracy(g)
+        # Last vertices first: they sit in the densest core, so a large clique
+        # turns up early and most other subproblems are pruned unopened
+        for v in reversed(dg.order):
+            later, _ = dg.split(v)
+            if self._pruned(len(later) + 1):
+                continue
+            self.root, self.verts = v, later
+            if self.verts:
+                self.expand([], (1 << len(self.verts)) - 1, dg.bitsets(later))
+            else:
+                self._found([])
+        return self.best
+
+
+def maximum_cliques(g, keep_all=True):
+    """All maximum cliques as lists of vertex ids (just one if keep_all is False)"""
+    return _MaxCliqueSearch(keep_all).run(g)
+
+
+def maximum_clique(g):
+    """One maximum clique as a list of vertex ids"""
+    best = maximum_cliques(g, keep_all=False)
+    return best[0] if best else []
+
+
+def clique_number(g):
+    return len(maximum_clique(g))
+
+
+def cliques_maximum(g):
+    """Like Sage's G.cliques_maximum(): every maximum clique, as lists of vertex names"""
+    return [[g.names[v] for v in clique] for clique in maximum_cliques(g)]
@@ -0,0 +1,148 @@
+"""
+Integer-indexed graph in CSR form
+
+Vertices are 0..n-1 with a name table; the neighbours of v are
+indices[indptr[v]:indptr[v+1]]. An undirected edge is stored in both
+directions, and both slots carry the same edge id, weight and label.
+
+Usage:
+    g = build_csr(names, src, dst, weights)
+    g = from_dict_of_dicts({"Home": {"School": "B"}, ...})
+    g.neighbors(g.vertex_id("Home"))
+"""
+
+from numbers import Number
+
+import numpy as np
+
+
+class CSRGraph:
+    """CSR adjacency with optional per-edge weights and labels"""
+
+    def __init__(self, names, indptr, indices, edge_ids, n_edges, weights=None, labels=None,
+                 label_names=None, directed=False):
+        self.names = names                  # vertex id -> name (any sequence)
+        self.m = n_edges
+        self.indptr = indptr
+        self.indices = indices
+        self.edge_ids = edge_ids            # slot -> edge id (0..m-1)
+        self.weights = weights              # slot -> weight, or None
+        self.labels = labels                # slot -> label code, or None
+        self.label_names = label_names      # code -> label string
+        self.directed = directed
+        self.cache = {}                     # derived results (e.g. eccentricities), see distance_metrics
+        self._ids = None
+
+    @property
+    def n(self):
+        return len(self.indptr) - 1
+
+    def vertex_id(self, name):
+        if self._ids is None:
+            self._ids = {v: i for i, v in enumerate(self.names)}
+        return self._ids[name]
+
+    def degree(self):
+        """Degree of every vertex as an array"""
+        return np.diff(self.indptr)
+
+    def neighbors(self, v):
+        return self.indices[self.indptr[v]:self.indptr[v + 1]]
+
+    def slot_sources(self):
+        """Source vertex of every CSR slot"""
+        return np.repeat(np.arange(self.n, dtype=self.indices.dtype), np.diff(self.indptr))
+
+    def edge_list(self):
+        """(src, dst) arrays with one entry per edge, ordered by edge id (src <= dst if undirected)"""
+        src = self.slot_sources()
+        keep = slice(None) if self.directed else src <= self.indices
+        ids = self.edge_ids[keep]
+        u = np.empty(self.m, dtype=self.indices.dtype)
+        v = np.empty(self.m, dtype=self.indices.dtype)
+        u[ids] = src[keep]
+        v[ids] = self.indices[keep]
+        return u, v
+
+    def edge_weights(self):
+        """Weight per edge id (1.0 everywhere for an unweighted graph)"""
+        if self.weights is None:
+            return np.ones(self.m)
+        w = np.empty(self.m, dtype=self.weights.dtype)
+        w[self.edge_ids] = self.weights
+        return w
+
+    def __repr__(self):
+        kind = "directed" if self.directed else "undirected"
+        return f"CSRGraph({kind}, n={self.n}, m={self.m})"
+
+
+def _index_dtype(n):
+    return np.int32 if n < 2**31 else np.int64
+
+
+def build_csr(names, src, dst, weights=None, labels=None, label_names=None, directed=False):
+    """
+    CSR graph from edge arrays over vertex ids 0..len(names)-1.
+
+    Edge k is (src[k], dst[k]) with optional weights[k] and labels[k] (codes
+    into label_names). Undirected edges are stored in both directions.
+    """
+    n = len(names)
+    src = np.asarray(src)
+    dst = np.asarray(dst)
+    m = len(src)
+    edge = np.arange(m, dtype=np.int64)
+    if directed:
+        rows, cols, ids = src, dst, edge
+    else:
+        loops = src == dst
+        rows = np.concatenate([src, dst[~loops]])
+        cols = np.concatenate([dst, src[~loops]])
+        ids = np.concatenate([edge, edge[~loops]])
+
+    order = np.argsort(rows, kind='stable')
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+    indices = cols[order].astype(_index_dtype(n), copy=False)
+    ids = ids[order]
+    w = None if weights is None else np.asarray(weights)[ids]
+    lab = None if labels is None else np.asarray(labels)[ids]
+    return CSRGraph(names, indptr, indices, ids, m, w, lab, label_names, directed)
+
+
+def from_dict_of_dicts(data, directed=False):
+    """
+    CSR graph from a Sage/NetworkX style dict-of-dicts literal {u: {v: value}}.
+
+    Vertices are numbered in order of first appearance. Numeric values become
+    weights, other non-None values become edge labels. For undirected graphs an
+    edge listed from both ends is kept once (first occurrence wins).
+    """
+    ids = {}
+    src, dst, values = [], [], []
+    seen = set()
+    for u, nbrs in data.items():
+        ids.setdefault(u, len(ids))
+        for v, value in nbrs.items():
+            ids.setdefault(v, len(ids))
+            key = (ids[u], ids[v]) if directed else frozenset((ids[u], ids[v]))
+            if key in seen:
+                continue
+            seen.add(key)
+            src.append(ids[u])
+            dst.append(ids[v])
+            values.append(value)
+
+    weights = labels = label_names = None
+    present = [x for x in values if x is not None]
+    if present and all(isinstance(x, Number) for x in present):
+        weights = np.array([1.0 if x is None else float(x) for x in values])
+    elif present:
+        label_names = sorted({str(x) for x in present})
+        if len(present) < len(values):
+            label_names.append(None)    # code for unlabelled edges
+        code = {name: i for i, name in enumerate(label_names)}
+        labels = np.array([code[None if x is None else str(x)] for x in values], dtype=np.int32)
+    return build_csr(list(ids), np.array(src, dtype=np.int64), np.array(dst, dtype=np.int64),
+                     weights, labels, label_names, directed)
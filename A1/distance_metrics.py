@@ -0,0 +1,154 @@
+"""
+Eccentricity, diameter, radius and center from a few BFS passes
+
+G.diameter(), G.radius() and G.center() in the notebook each compute every
+eccentricity from scratch. Here they come from one set of eccentricities,
+cached on the graph handle (g.cache), and the BFS passes are kept few:
+
+- eccentricities: the bounding technique of Takes and Kosters. Every BFS
+  from v (eccentricity e) bounds each w by
+      max(d(v, w), e - d(v, w)) <= ecc(w) <= e + d(v, w)
+  and the next source alternates between the candidate with the largest
+  upper bound and the one with the smallest lower bound, until every
+  bound is tight. On road-like and other sparse real-world graphs that is
+  a handful of BFS (11 on a 300 x 300 grid); random expanders, where
+  almost every vertex has the same eccentricity, stay close to n.
+- diameter alone (BoundingDiameters): the same loop, but a vertex whose
+  upper bound is no larger than the best lower bound stops being a
+  candidate, so the loop ends as soon as the maximum is pinned down.
+
+Distances are hop counts (unweighted), as in Sage's defaults. A
+disconnected graph has every eccentricity infinite.
+
+Usage:
+    report = distance_report(location_graph())
+    report['diameter'], report['radius'], report['center'], report['max_degree_vertices']
+    diameter(g)                 # without computing every eccentricity
+"""
+
+import numpy as np
+from scipy.sparse.csgraph import connected_components, shortest_path
+
+from apsp import weight_matrix
+
+
+def _hop_matrix(g):
+    if g.directed:
+        raise ValueError("eccentricities are implemented for undirected graphs")
+    if 'hop_matrix' not in g.cache:
+        g.cache['hop_matrix'] = weight_matrix(g, weighted=False)
+    return g.cache['hop_matrix']
+
+
+def is_connected(g):
+    if 'connected' not in g.cache:
+        g.cache['connected'] = g.n > 0 and connected_components(_hop_matrix(g), directed=False)[0] == 1
+    return g.cache['connected']
+
+
+def _bfs(g, sources, stats):
+    """Hop distances (int64) from each source; one row per source"""
+    stats['bfs'] = stats.get('bfs', 0) + len(np.atleast_1d(sources))
+    return shortest_path(_hop_matrix(g), method='D', unweighted=True, indices=sources).astype(np.int64)
+
+
+def _stats(g):
+    return g.cache.setdefault('bfs_stats', {})
+
+
+def _bounding(g, diameter_only=False):
+    """
+    Eccentricity bounds (lo, hi) refined by BFS until every candidate is tight.
+    With diameter_only, vertices whose upper bound cannot beat the best
+    lower bound so far stop being candidates.
+    """
+    n = g.n
+    stats = _stats(g)
+    degree = g.degree()
+    lo = np.zeros(n, dtype=np.int64)
+    hi = np.full(n, n, dtype=np.int64)
+    open_ = np.ones(n, dtype=bool)
+    pick_high = True
+    while open_.any():
+        cand = np.flatnonzero(open_)
+        # Largest upper bound / smallest lower bound, ties broken towards high degree
+        if pick_high:
+            v = cand[np.lexsort((-degree[cand], -hi[cand]))[0]]
+        else:
+            v = cand[np.lexsort((-degree[cand], lo[cand]))[0]]
+        pick_high = not pick_high
+        d = _bfs(g, v, stats)
+        e = d.max()
+        np.maximum(lo, np.maximum(d, e - d), out=lo)
+        np.minimum(hi, e + d, out=hi)
+        lo[v] = hi[v] = e
+        open_ &= lo != hi
+        if diameter_only:
+            open_ &= hi > lo.max()
+    return lo, hi
+
+
+def eccentricities(g):
+    """Eccentricity of every vertex (cached); float inf everywhere if g is disconnected"""
+    if 'eccentricities' not in g.cache:
+        if is_connected(g):
+            g.cache['eccentricities'] = _bounding(g)[0]
+        else:
+            g.cache['eccentricities'] = np.full(g.n, np.inf)
+    return g.cache['eccentricities']
+
+
+def diameter(g):
+    """Diameter (inf if disconnected) from eccentricity bounds, stopping once the maximum is pinned down"""
+    if 'eccentricities' in g.cache:
+        return int(g.cache['eccentricities'].max()) if is_connected(g) else np.inf
+    if 'diameter' not in g.cache:
+        g.cache['diameter'] = int(_bounding(g, diameter_only=True)[0].max()) if is_connected(g) else np.inf
+    return g.cache['diameter']
+
+
+def radius(g):
+    ecc = eccentricities(g)
+    return ecc.min() if g.n else 0
+
+
+def center(g):
+    """Vertex ids of minimum eccentricity"""
+    ecc = eccentricities(g)
+    return np.flatnonzero(ecc == ecc.min()) if is_connected(g) else np.array([], dtype=np.int64)
+
+
+def periphery(g):
+    """Vertex ids of maximum eccentricity"""
+    ecc = eccentricities(g)
+    return np.flatnonzero(ecc == ecc.max()) if is_connected(g) else np.array([], dtype=np.int64)
+
+
+def degree_stats(g):
+    """Minimum, maximum and average degree with the vertices attaining the extremes (names)"""
+    deg = g.degree()
+    if g.n == 0:
+        return {'min_degree': 0, 'max_degree': 0, 'avg_degree': 0.0,
+                'min_degree_vertices': [], 'max_degree_vertices': []}
+    lo, hi = int(deg.min()), int(deg.max())
+    return {'min_degree': lo, 'max_degree': hi, 'avg_degree': float(deg.mean()),
+            'min_degree_vertices': [g.names[v] for v in np.flatnonzero(deg == lo)],
+            'max_degree_vertices': [g.names[v] for v in np.flatnonzero(deg == hi)]}
+
+
+def distance_report(g):
+    """
+    Diameter, radius, center and periphery (as names), eccentricity per vertex
+    and the degree statistics, from one eccentricity computation.
+    """
+    ecc = eccentricities(g)
+    connected = is_connected(g)
+    report = {'n': g.n, 'm': g.m, 'connected': connected,
+              'diameter': int(ecc.max()) if connected else np.inf,
+              'radius': int(ecc.min()) if connected else np.inf,
+              'center': [g.names[v] for v in center(g)],
+              'periphery': [g.names[v] for v in periphery(g)],
+              'eccentricity': {g.names[v]: (int(e) if connected else e) for v, e in enumerate(ecc)},
+              'bfs_passes': _stats(g).get('bfs', 0)}
+    report.update(degree_stats(g))
+    return report
@@ -0,0 +1,207 @@
+"""
+Edge-label index and filtered subgraph views
+
+The Q1 notebook finds the bus-only subgraph by testing G.edge_label(a, b)
+on every edge, and the plot styling does the same scan once per label.
+EdgeLabelIndex groups the edge ids by label once (one stable argsort of the
+label codes) and keeps one packed bitset over the edge ids per label, so:
+
+- the edges of a label are a slice of that ordering (no scan, no copy)
+- a multi-label query ("walk or bus") is a bitwise OR of packed bitsets,
+  m / 8 bytes per label
+- SubgraphView keeps the parent CSRGraph plus that bitset; neighbours,
+  degrees and components are answered through a per-slot mask instead of
+  building a new graph
+
+Components use the edges of the view only, so isolated vertices of the
+parent count as their own components; vertices() are the vertices touched by
+an edge of the view, which is what Sage's Graph(edge list) contains.
+
+Usage:
+    index = EdgeLabelIndex(location_graph())
+    bus = index.view('B')
+    bus.is_connected(), bus.is_connected(spanning=True), len(bus.components())
+    index.view('W', 'B').reachable(g.vertex_id('Home'))
+    reachability_report(index, ['W', 'B', 'M', ('W', 'B')])
+"""
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+from csr_graph import build_csr
+
+_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1)
+
+
+class EdgeLabelIndex:
+    """Edge ids grouped by label, plus a packed bitset over edge ids per label"""
+
+    def __init__(self, g):
+        if g.labels is None:
+            raise ValueError("graph has no edge labels")
+        self.g = g
+        codes = np.empty(g.m, dtype=g.labels.dtype)
+        codes[g.edge_ids] = g.labels
+        self.codes = codes                              # edge id -> label code
+        self.order = np.argsort(codes, kind='stable')   # edge ids grouped by label
+        n_labels = len(g.label_names)
+        self.bounds = np.searchsorted(codes[self.order], np.arange(n_labels + 1))
+        self.bits = [np.packbits(codes == c, bitorder='little') for c in range(n_labels)]
+        self._code = {name: c for c, name in enumerate(g.label_names)}
+        self._ends = None
+
+    def code(self, label):
+        try:
+            return self._code[label]
+        except KeyError:
+            raise KeyError(f"unknown edge label {label!r}, expected one of {list(self._code)}") from None
+
+    def edges(self, label):
+        """Edge ids with this label (a view into the grouped ordering)"""
+        c = self.code(label)
+        return self.order[self.bounds[c]:self.bounds[c + 1]]
+
+    def counts(self):
+        """{label: number of edges}"""
+        return {name: int(self.bounds[c + 1] - self.bounds[c]) for name, c in self._code.items()}
+
+    def bitset(self, *labels):
+        """Packed bitset (little bit order) of the edges carrying any of the labels"""
+        if not labels:
+            return np.zeros_like(self.bits[0]) if self.bits else np.zeros(0, dtype=np.uint8)
+        out = self.bits[self.code(labels[0])].copy()
+        for label in labels[1:]:
+            np.bitwise_or(out, self.bits[self.code(label)], out=out)
+        return out
+
+    def endpoints(self):
+        """(src, dst) per edge id, computed once"""
+        if self._ends is None:
+            self._ends = self.g.edge_list()
+        return self._ends
+
+    def view(self, *labels):
+        """Subgraph view on the edges with any of the given labels"""
+        return SubgraphView(self, self.bitset(*labels), labels)
+
+
+class SubgraphView:
+    """Read-only subgraph of index.g restricted to the edges in a packed bitset"""
+
+    def __init__(self, index, bits, labels=()):
+        self.index = index
+        self.g = index.g
+        self.bits = bits
+        self.labels = labels
+        self._edge_mask = self._slot_mask = self._components = None
+
+    def edge_mask(self):
+        """Boolean array over edge ids"""
+        if self._edge_mask is None:
+            self._edge_mask = np.unpackbits(self.bits, count=self.g.m, bitorder='little').view(bool)
+        return self._edge_mask
+
+    def slot_mask(self):
+        """Boolean array over the CSR slots of the parent graph"""
+        if self._slot_mask is None:
+            self._slot_mask = self.edge_mask()[self.g.edge_ids]
+        return self._slot_mask
+
+    @property
+    def n(self):
+        return self.g.n
+
+    def number_of_edges(self):
+        return int(_POPCOUNT[self.bits].sum())
+
+    def edge_ids(self):
+        return np.flatnonzero(self.edge_mask())
+
+    def has_edge_id(self, e):
+        return bool((self.bits[e >> 3] >> (e & 7)) & 1)
+
+    def neighbors(self, v):
+        a, b = self.g.indptr[v], self.g.indptr[v + 1]
+        return self.g.indices[a:b][self.slot_mask()[a:b]]
+
+    def degree(self):
+        """Degree of every vertex of the parent graph inside the view"""
+        counts = np.concatenate(([0], np.cumsum(self.slot_mask(), dtype=np.int64)))
+        return counts[self.g.indptr[1:]] - counts[self.g.indptr[:-1]]
+
+    def vertices(self):
+        """Vertex ids touched by at least one edge of the view"""
+        return np.flatnonzero(self.degree() > 0)
+
+    def _component_labels(self):
+        if self._components is None:
+            src, dst = self.index.endpoints()
+            keep = self.edge_mask()
+            n = self.g.n
+            A = coo_matrix((np.ones(int(keep.sum()), dtype=np.int8), (src[keep], dst[keep])), shape=(n, n))
+            self._components = connected_components(A, directed=False)[1]
+        return self._components
+
+    def components(self, spanning=False):
+        """
+        Connected components as arrays of vertex ids, largest first. Only
+        touched vertices are included unless spanning=True.
+        """
+        comp = self._component_labels()
+        verts = np.arange(self.g.n) if spanning else self.vertices()
+        if len(verts) == 0:
+            return []
+        order = verts[np.argsort(comp[verts], kind='stable')]
+        cuts = np.flatnonzero(np.diff(comp[order])) + 1
+        parts = np.split(order, cuts)
+        parts.sort(key=len, reverse=True)
+        return parts
+
+    def is_connected(self, spanning=False):
+        """
+        True if the touched vertices form one component; with spanning=True,
+        every vertex of the parent graph must be reachable inside the view.
+        """
+        comp = self._component_labels()
+        verts = np.arange(self.g.n) if spanning else self.vertices()
+        return len(verts) > 0 and bool((comp[verts] == comp[verts[0]]).all())
+
+    def reachable(self, source):
+        """Vertex ids reachable from source using only edges of the view"""
+        comp = self._component_labels()
+        return np.flatnonzero(comp == comp[source])
+
+    def to_csr(self):
+        """Materialize the view as a CSRGraph on the same vertex set (copies the selected edges)"""
+        src, dst = self.index.endpoints()
+        ids = self.edge_ids()
+        g = self.g
+        weights = None if g.weights is None else g.edge_weights()[ids]
+        labels = self.index.codes[ids]
+        return build_csr(g.names, src[ids], dst[ids], weights, labels, g.label_names, g.directed)
+
+    def __repr__(self):
+        return f"SubgraphView(labels={list(self.labels)}, n={self.g.n}, m={self.number_of_edges()})"
+
+
+def reachability_report(index, queries, source=None):
+    """
+    One row per query (a label or a tuple of labels): edge and touched vertex
+    counts, number of components, connected / spanning flags and, if source
+    is given, how many vertices it reaches.
+    """
+    rows = []
+    for query in queries:
+        labels = (query,) if isinstance(query, str) else tuple(query)
+        view = index.view(*labels)
+        row = {'labels': '+'.join(map(str, labels)),
+               'edges': view.number_of_edges(),
+               'vertices': len(view.vertices()),
+               'components': len(view.components()),
+               'connected': view.is_connected(),
+               'spanning': view.is_connected(spanning=True)}
+        if source is not None:
+            row['reachable'] = len(view.reachable(source))
+        rows.append(row)
+    return rows
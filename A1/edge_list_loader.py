@@ -0,0 +1,128 @@
+"""
+Streaming edge-list CSV loader
+
+Reads a `source,target[,weight]` CSV (like Reading_from_CSV/graph_data.csv)
+in fixed-size chunks (whole lines, about chunk_bytes at a time) instead of
+building one big list of tuples.
+Vertex labels are interned into a string -> int table as they appear, and
+edges go straight into typed arrays (src, dst, weight) that grow by doubling.
+At the end the arrays are turned into a CSRGraph (see csr_graph.py).
+
+Same tolerance as graph_from_csv in Reading_CSV.ipynb: fields are stripped
+(`E, A, 4` works), the first row is a header, rows with fewer than two fields
+are skipped, and a missing or non-numeric weight counts as 1.0.
+
+Like the Sage Graph it replaces, a repeated edge is stored once (the last
+row's weight wins; for undirected graphs u,v and v,u are the same edge), so
+degrees count distinct neighbours. multiedges=True keeps every row as its
+own parallel edge.
+
+Usage:
+    g = load_edge_list('Reading_from_CSV/graph_data.csv')
+    g.names, g.indptr, g.indices, g.weights
+"""
+
+import csv
+
+import numpy as np
+
+from csr_graph import build_csr
+
+DEFAULT_CHUNK_BYTES = 1 << 22
+
+
+class EdgeBuffer:
+    """Growable typed arrays of (src, dst, weight)"""
+
+    def __init__(self, capacity=1 << 16, id_dtype=np.int32, weight_dtype=np.float64):
+        self.size = 0
+        self.src = np.empty(capacity, dtype=id_dtype)
+        self.dst = np.empty(capacity, dtype=id_dtype)
+        self.weight = np.empty(capacity, dtype=weight_dtype)
+
+    def _reserve(self, extra):
+        need = self.size + extra
+        if need <= len(self.src):
+            return
+        capacity = max(need, 2 * len(self.src))
+        for name in ('src', 'dst', 'weight'):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+    def extend(self, src, dst, weight):
+        k = len(src)
+        self._reserve(k)
+        self.src[self.size:self.size + k] = src
+        self.dst[self.size:self.size + k] = dst
+        self.weight[self.size:self.size + k] = weight
+        self.size += k
+
+    def arrays(self):
+        return self.src[:self.size], self.dst[:self.size], self.weight[:self.size]
+
+
+def _parse_weight(field):
+    try:
+        return float(field)
+    except ValueError:
+        return 1.0
+
+
+def iter_edge_chunks(path, chunk_bytes=DEFAULT_CHUNK_BYTES, header=True):
+    """Yield lists of (source, target, weight) rows, one list per chunk of about chunk_bytes"""
+    with open(path, 'r', newline='') as f:
+        if header:
+            next(f, None)
+        while True:
+            lines = f.readlines(chunk_bytes)
+            if not lines:
+                break
+            rows = []
+            for line in lines:
+                # Plain split is enough unless the line uses CSV quoting
+                fields = next(csv.reader([line])) if '"' in line else line.split(',')
+                if len(fields) < 2:
+                    continue
+                weight = _parse_weight(fields[2].strip()) if len(fields) >= 3 else 1.0
+                rows.append((fields[0].strip(), fields[1].strip(), weight))
+            yield rows
+
+
+def dedupe_edges(src, dst, weight, directed=False):
+    """One copy of each edge, in order of first appearance, with the weight of its last row"""
+    lo, hi = (src, dst) if directed else (np.minimum(src, dst), np.maximum(src, dst))
+    keys = (lo.astype(np.int64) << 32) | hi.astype(np.int64)
+    unique, first = np.unique(keys, return_index=True)
+    if len(unique) == len(keys):
+        return src, dst, weight
+    # First index in the reversed keys is the last row of each edge (same sorted key order)
+    last = len(keys) - 1 - np.unique(keys[::-1], return_index=True)[1]
+    order = np.argsort(first)
+    return src[first[order]], dst[first[order]], weight[last[order]]
+
+
+def load_edge_list(path, chunk_bytes=DEFAULT_CHUNK_BYTES, header=True, directed=False,
+                   weight_dtype=np.float64, multiedges=False):
+    """Load an edge-list CSV into a CSRGraph, streaming it chunk by chunk (see the module docstring for repeats)"""
+    ids = {}
+    intern = ids.setdefault
+    buf = EdgeBuffer(weight_dtype=weight_dtype)
+    for rows in iter_edge_chunks(path, chunk_bytes, header):
+        src, dst, weight = [], [], []
+        for a, b, w in rows:
+            src.append(intern(a, len(ids)))
+            dst.append(intern(b, len(ids)))
+            weight.append(w)
+        buf.extend(src, dst, weight)
+    names = list(ids)
+    src, dst, weight = buf.arrays()
+    if not multiedges:
+        src, dst, weight = dedupe_edges(src, dst, weight, directed)
+    return build_csr(names, src, dst, weight, directed=directed)
+
+
+def graph_from_csv(data):
+    """Drop-in for the notebook's graph_from_csv, returning a CSRGraph"""
+    return load_edge_list(data)
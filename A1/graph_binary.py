@@ -0,0 +1,162 @@
+"""
+Compact binary graph format with memory-mapped loading
+
+Layout (little-endian):
+    header      magic, version, flags, n, m, then (offset, nbytes, dtype) per section
+    sections    indptr, indices, edge_ids, weights, labels,
+                name_offsets, name_data, label_offsets, label_data
+Every section starts on a 64-byte boundary. A missing section (None in the
+graph) has an empty dtype entry; a present but empty one (e.g. the indices
+of a graph with no edges) keeps its dtype with nbytes 0.
+Names and label strings are stored as UTF-8 blobs with uint64 offsets.
+
+read_graph() mmaps the file and returns a CSRGraph whose arrays are zero-copy
+NumPy views into the mapping; vertex names are decoded lazily, so opening a
+huge graph costs about as much as reading the header.
+
+Usage:
+    python graph_binary.py Reading_from_CSV/graph_data.csv graph_data.grb
+    dict_to_binary(LOCATIONS, 'locations.grb')      # Q1 dict-of-dicts literal
+    g = read_graph('graph_data.grb')
+"""
+
+import mmap
+import struct
+import sys
+
+import numpy as np
+
+from csr_graph import CSRGraph
+
+MAGIC = b'CSRGRPH\0'
+VERSION = 1
+FLAG_DIRECTED = 1
+ALIGN = 64
+SECTIONS = ('indptr', 'indices', 'edge_ids', 'weights', 'labels',
+            'name_offsets', 'name_data', 'label_offsets', 'label_data')
+_HEAD = struct.Struct('<8sIIQQ')
+_SECTION = struct.Struct('<QQ8s')
+HEADER_SIZE = _HEAD.size + _SECTION.size * len(SECTIONS)
+
+
+class StringTable:
+    """Read-only sequence of strings backed by an offsets array and a UTF-8 blob"""
+
+    def __init__(self, offsets, data):
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        return bytes(self.data[self.offsets[i]:self.offsets[i + 1]]).decode('utf-8')
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+def _encode_strings(strings):
+    blobs = [('' if s is None else str(s)).encode('utf-8') for s in strings]
+    offsets = np.zeros(len(blobs) + 1, dtype=np.uint64)
+    np.cumsum([len(b) for b in blobs], out=offsets[1:])
+    return offsets, np.frombuffer(b''.join(blobs), dtype=np.uint8)
+
+
+def _pad(offset):
+    return (offset + ALIGN - 1) // ALIGN * ALIGN
+
+
+def write_graph(path, g):
+    """Write a CSRGraph to path in the binary format"""
+    arrays = dict.fromkeys(SECTIONS)
+    arrays['indptr'] = np.ascontiguousarray(g.indptr, dtype='<i8')
+    arrays['indices'] = np.ascontiguousarray(g.indices)
+    arrays['edge_ids'] = np.ascontiguousarray(g.edge_ids)
+    if g.weights is not None:
+        arrays['weights'] = np.ascontiguousarray(g.weights)
+    if g.labels is not None:
+        arrays['labels'] = np.ascontiguousarray(g.labels)
+        arrays['label_offsets'], arrays['label_data'] = _encode_strings(g.label_names)
+    arrays['name_offsets'], arrays['name_data'] = _encode_strings(g.names)
+
+    table = []
+    offset = _pad(HEADER_SIZE)
+    for name in SECTIONS:
+        arr = arrays[name]
+        if arr is None:
+            table.append((0, 0, b''))
+            continue
+        table.append((offset, arr.nbytes, arr.dtype.str.encode('ascii')))
+        offset = _pad(offset + arr.nbytes)
+
+    flags = FLAG_DIRECTED if g.directed else 0
+    with open(path, 'wb') as f:
+        f.write(_HEAD.pack(MAGIC, VERSION, flags, g.n, g.m))
+        for entry in table:
+            f.write(_SECTION.pack(*entry))
+        for name, (start, nbytes, _) in zip(SECTIONS, table):
+            if nbytes == 0:
+                continue
+            f.write(b'\0' * (start - f.tell()))
+            arrays[name].tofile(f)
+
+
+def read_graph(path):
+    """Memory-map a binary graph file and return a CSRGraph of zero-copy views"""
+    with open(path, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, flags, n, m = _HEAD.unpack_from(mm, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a binary graph file")
+    if version != VERSION:
+        raise ValueError(f"unsupported binary graph version {version}")
+
+    views = {}
+    for i, name in enumerate(SECTIONS):
+        start, nbytes, dtype = _SECTION.unpack_from(mm, _HEAD.size + i * _SECTION.size)
+        dtype = dtype.rstrip(b'\0')
+        if not dtype:
+            views[name] = None
+            continue
+        dt = np.dtype(dtype.decode('ascii'))
+        if nbytes == 0:
+            views[name] = np.empty(0, dtype=dt)
+            continue
+        views[name] = np.frombuffer(mm, dtype=dt, count=nbytes // dt.itemsize, offset=start)
+
+    empty = np.zeros(0, dtype=np.uint8)
+    names = StringTable(views['name_offsets'], views['name_data'] if views['name_data'] is not None else empty)
+    label_names = None
+    if views['labels'] is not None:
+        label_data = views['label_data'] if views['label_data'] is not None else empty
+        label_names = list(StringTable(views['label_offsets'], label_data))
+    return CSRGraph(names, views['indptr'], views['indices'], views['edge_ids'], m,
+                    views['weights'], views['labels'], label_names, bool(flags & FLAG_DIRECTED))
+
+
+def csv_to_binary(csv_path, out_path):
+    """Convert an edge-list CSV (as read by graph_from_csv) to the binary format"""
+    from edge_list_loader import load_edge_list
+
+    write_graph(out_path, load_edge_list(csv_path))
+
+
+def dict_to_binary(data, out_path):
+    """Convert a dict-of-dicts literal (as in Q1_Solution.ipynb) to the binary format"""
+    from csr_graph import from_dict_of_dicts
+
+    write_graph(out_path, from_dict_of_dicts(data))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3:
+        print("Usage: python graph_binary.py <edges.csv> <output.grb>")
+        sys.exit(1)
+    csv_to_binary(sys.argv[1], sys.argv[2])
+    print(f"Wrote {sys.argv[2]}: {read_graph(sys.argv[2])}")
@@ -0,0 +1,339 @@
+"""
+Hamiltonian cycle search with a time budget
+
+Small graphs (n <= DP_MAX_N) use the Held-Karp style bitmask DP: dp[S] is the
+set of vertices where a path from vertex 0 through exactly S can end, filled
+layer by layer (|S| = 1, 2, ...) with NumPy over all masks of a layer.
+
+Larger graphs use backtracking from a vertex s of minimum degree, with the
+path s -> a -> ... required to come back through a neighbour of s larger
+than a (each cycle is searched in one direction only). At every node:
+- degree: each unvisited vertex needs two usable edges; a neighbour of the
+  path end with exactly two must be visited next (forced move)
+- connectivity: the unvisited vertices must all be reachable from the end
+- cut vertices: unvisited + {end, s} plus the closing edge end-s must be
+  2-connected, otherwise no Hamiltonian end-s path exists (this also
+  catches every bridge)
+Top-level branches (s, a, b) are spread over worker processes; the first
+cycle found stops the others.
+
+The answer is three-state: FOUND (with the cycle), NONE (proven) or TIMEOUT.
+
+Usage:
+    result = hamiltonian_cycle(g, budget=10, workers=4)
+    result.status, [g.names[v] for v in result.cycle], result.stats
+"""
+
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from cliques import simple_adjacency
+
+FOUND, NONE, TIMEOUT = 'found', 'none', 'timeout'
+DP_MAX_N = 25
+CHECK_EVERY = 256           # search nodes between deadline / stop checks
+
+
+class HamiltonResult:
+    """status is FOUND, NONE or TIMEOUT; cycle lists vertex ids (first vertex not repeated)"""
+
+    def __init__(self, status, cycle=None, stats=None):
+        self.status = status
+        self.cycle = cycle
+        self.stats = stats or {}
+
+    def __repr__(self):
+        return f"HamiltonResult({self.status}, cycle={self.cycle}, stats={self.stats})"
+
+
+class _Abort(Exception):
+    pass
+
+
+def _bits(b):
+    while b:
+        low = b & -b
+        yield low.bit_length() - 1
+        b ^= low
+
+
+def _masks(g):
+    indptr, indices = simple_adjacency(g)
+    adj = [0] * g.n
+    for v in range(g.n):
+        for u in indices[indptr[v]:indptr[v + 1]].tolist():
+            adj[v] |= 1 << u
+    return adj
+
+
+def _is_biconnected(adj, R):
+    """True if the graph induced on vertex mask R is connected and has no cut vertex"""
+    root = (R & -R).bit_length() - 1
+    disc, low = {root: 0}, {root: 0}
+    stack = [(root, -1, adj[root] & R)]
+    root_children = 0
+    while stack:
+        v, parent, todo = stack[-1]
+        if todo:
+            low_bit = todo & -todo
+            stack[-1] = (v, parent, todo ^ low_bit)
+            w = low_bit.bit_length() - 1
+            if w == parent:
+                continue
+            if w in disc:
+                low[v] = min(low[v], disc[w])
+            else:
+                disc[w] = low[w] = len(disc)
+                if v == root:
+                    root_children += 1
+                stack.append((w, v, adj[w] & R))
+        else:
+            stack.pop()
+            if parent >= 0:
+                low[parent] = min(low[parent], low[v])
+                if parent != root and low[v] >= disc[parent]:
+                    return False
+    return root_children <= 1 and len(disc) == R.bit_count()
+
+# ----------------------------------------------------------------------------
+# Bitmask DP
+# ----------------------------------------------------------------------------
+
+def _dp_cycle(adj, n, deadline, stats):
+    """Hamiltonian cycle by bitmask DP, or None; raises _Abort past the deadline"""
+    N = n - 1                                   # vertex i >= 1 is bit i - 1
+    nb = [adj[v] >> 1 for v in range(n)]
+    dp = np.zeros(1 << N, dtype=np.uint32)
+    for v in _bits(nb[0]):
+        dp[1 << v] = 1 << v
+    masks = np.arange(1 << N, dtype=np.uint32)
+    count = np.zeros(1 << N, dtype=np.uint8)
+    for v in range(N):
+        count += ((masks >> v) & 1).astype(np.uint8)
+    del masks
+
+    for k in range(1, N):
+        if deadline is not None and time.time() > deadline:
+            raise _Abort
+        layer = np.flatnonzero(count == k).astype(np.uint32)
+        ends = dp[layer]
+        live = ends != 0
+        layer, ends = layer[live], ends[live]
+        stats['dp_states'] = stats.get('dp_states', 0) + len(layer)
+        for v in range(N):
+            bit = np.uint32(1 << v)
+            ok = ((layer & bit) == 0) & ((ends & np.uint32(nb[v + 1])) != 0)
+            dp[layer[ok] | bit] |= bit
+
+    full = (1 << N) - 1
+    last = int(dp[full]) & nb[0]
+    if not last:
+        return None
+    v = (last & -last).bit_length() - 1
+    mask, path = full, [v]
+    while mask != 1 << v:
+        mask ^= 1 << v
+        choices = int(dp[mask]) & nb[v + 1]
+        v = (choices & -choices).bit_length() - 1
+        path.append(v)
+    return [0] + [u + 1 for u in reversed(path)]
+
+# ----------------------------------------------------------------------------
+# Backtracking
+# ----------------------------------------------------------------------------
+
+class _Backtrack:
+    def __init__(self, adj, start, closing, deadline=None, stop=None):
+        self.adj = adj
+        self.full = (1 << len(adj)) - 1
+        self.start = start
+        self.closing = closing          # vertices allowed right before returning to start
+        self.deadline = deadline
+        self.stop = stop
+        self.stats = {'nodes': 0, 'forced': 0, 'pruned_degree': 0, 'pruned_connectivity': 0,
+                      'pruned_cut_vertex': 0}
+
+    def _check_time(self):
+        if (self.deadline is not None and time.time() > self.deadline) or \
+                (self.stop is not None and self.stop.is_set()):
+            raise _Abort
+
+    def _usable(self, w, R):
+        avail = self.adj[w] & R
+        if not (self.closing >> w) & 1:
+            avail &= ~(1 << self.start)
+        return avail
+
+    def extend(self, path, visited):
+        stats = self.stats
+        stats['nodes'] += 1
+        if stats['nodes'] % CHECK_EVERY == 0:
+            self._check_time()
+        end = path[-1]
+        free = self.full & ~visited
+        if not free:
+            return path if (self.closing >> end) & 1 else None
+
+        # Degree: every free vertex needs two usable edges; forced moves from the end
+        R = free | (1 << end) | (1 << self.start)
+        forced = None
+        for w in _bits(free):
+            avail = self._usable(w, R)
+            d = avail.bit_count()
+            if d < 2 or (d == 2 and (avail >> end) & 1 and forced is not None):
+                stats['pruned_degree'] += 1
+                return None
+            if d == 2 and (avail >> end) & 1:
+                forced = w
+
+        # Connectivity: all free vertices reachable from the end through free vertices
+        seen = frontier = self.adj[end] & free
+        while frontier:
+            nxt = 0
+            for v in _bits(frontier):
+                nxt |= self.adj[v]
+            frontier = nxt & free & ~seen
+            seen |= frontier
+        if seen != free:
+            stats['pruned_connectivity'] += 1
+            return None
+
+        # Cut vertices of free + {end, start} with the closing edge end-start
+        if free.bit_count() >= 2:
+            local = {v: self.adj[v] & (free | (1 << end)) for v in _bits(free)}
+            local[end] = (self.adj[end] & free) | (1 << self.start)
+            local[self.start] = (self.closing & free) | (1 << end)
+            for v in _bits(free):
+                if (self.closing >> v) & 1:
+                    local[v] |= 1 << self.start
+            if not _is_biconnected(local, R):
+                stats['pruned_cut_vertex'] += 1
+                return None
+
+        if forced is not None:
+            stats['forced'] += 1
+            candidates = [forced]
+        else:
+            # Fewest onward options first (Warnsdorff)
+            candidates = sorted(_bits(self.adj[end] & free), key=lambda w: self._usable(w, R).bit_count())
+        for w in candidates:
+            found = self.extend(path + [w], visited | (1 << w))
+            if found:
+                return found
+        return None
+
+
+def _branches(adj):
+    """(start, prefix paths, closing mask per prefix): start has minimum degree, split two levels deep"""
+    start = min(range(len(adj)), key=lambda v: adj[v].bit_count())
+    nbrs = list(_bits(adj[start]))
+    jobs = []
+    for i, a in enumerate(nbrs[:-1]):
+        closing = 0
+        for b in nbrs[i + 1:]:
+            closing |= 1 << b
+        for c in _bits(adj[a] & ~(1 << start)):
+            jobs.append(([start, a, c], closing))
+    return start, jobs
+
+
+_worker = {}
+
+
+def _init_worker(adj, deadline, stop):
+    _worker.update(adj=adj, deadline=deadline, stop=stop)
+
+
+def _run_branch(job, adj=None, deadline=None, stop=None):
+    if adj is None:
+        adj, deadline, stop = _worker['adj'], _worker['deadline'], _worker['stop']
+    prefix, closing = job
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), len(adj) + 100))     # one frame per path vertex
+    search = _Backtrack(adj, prefix[0], closing, deadline, stop)
+    if stop is not None and stop.is_set():
+        return TIMEOUT, None, search.stats
+    visited = 0
+    for v in prefix:
+        visited |= 1 << v
+    try:
+        cycle = search.extend(prefix, visited)
+    except _Abort:
+        return TIMEOUT, None, search.stats
+    if cycle and stop is not None:
+        stop.set()
+    return (FOUND if cycle else NONE), cycle, search.stats
+
+
+def _add_stats(total, stats):
+    for k, v in stats.items():
+        total[k] = total.get(k, 0) + v
+
+
+def hamiltonian_cycle(g, budget=None, workers=1, method='auto'):
+    """
+    Search for a Hamiltonian cycle of g within `budget` seconds (None: no limit).
+
+    method is 'dp', 'backtrack' or 'auto' (dp for n <= DP_MAX_N; 'dp' on a
+    larger graph raises ValueError, its table has 2^(n-1) entries). workers > 1
+    runs backtracking branches in a process pool. Returns a HamiltonResult.
+    """
+    if method == 'dp' and g.n > DP_MAX_N:
+        raise ValueError(f"method 'dp' needs n <= {DP_MAX_N}, got n = {g.n} (use 'backtrack')")
+    t0 = time.time()
+    deadline = None if budget is None else t0 + budget
+    adj = _masks(g)
+    n = g.n
+    stats = {'n': n}
+
+    def done(status, cycle=None):
+        stats['seconds'] = round(time.time() - t0, 4)
+        return HamiltonResult(status, cycle, stats)
+
+    if n < 3 or min(a.bit_count() for a in adj) < 2:
+        return done(NONE)
+    if not _is_biconnected(adj, (1 << n) - 1):
+        return done(NONE)
+
+    if method == 'auto':
+        method = 'dp' if n <= DP_MAX_N else 'backtrack'
+    stats['method'] = method
+    if method == 'dp':
+        try:
+            cycle = _dp_cycle(adj, n, deadline, stats)
+        except _Abort:
+            return done(TIMEOUT)
+        return done(FOUND, cycle) if cycle else done(NONE)
+    if method != 'backtrack':
+        raise ValueError(f"unknown method {method!r}")
+
+    _, jobs = _branches(adj)
+    stats['branches'] = len(jobs)
+    workers = min(workers or os.cpu_count() or 1, len(jobs)) or 1
+    timed_out = False
+    if workers <= 1:
+        for job in jobs:
+            status, cycle, branch_stats = _run_branch(job, adj, deadline)
+            _add_stats(stats, branch_stats)
+            if status == FOUND:
+                return done(FOUND, cycle)
+            if status == TIMEOUT:
+                return done(TIMEOUT)
+        return done(NONE)
+
+    stop = multiprocessing.Event()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(adj, deadline, stop)) as pool:
+        found = None
+        for status, cycle, branch_stats in pool.map(_run_branch, jobs):
+            _add_stats(stats, branch_stats)
+            if status == FOUND and found is None:
+                found = cycle
+            timed_out |= status == TIMEOUT
+    if found:
+        return done(FOUND, found)
+    return done(TIMEOUT if timed_out else NONE)
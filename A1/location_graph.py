@@ -0,0 +1,32 @@
+"""
+The location graph from Q1_Solution.ipynb as a plain dict-of-dicts
+
+Vertices are places, edge labels are the transport mode:
+"B" = bus, "W" = walking, "M" = metro.
+
+Usage:
+    from location_graph import location_graph
+    g = location_graph()    # CSRGraph with edge labels
+"""
+
+from csr_graph import from_dict_of_dicts
+
+LOCATIONS = {
+    "Home": {"School": "B", "Gym": "W", "Library": "B", "Friend1": "M", "Coffee": "W"},
+    "School": {"Library": "W", "Gym": "B", "Friend1": "B", "Work": "M"},
+    "Library": {"Park": "W", "Coffee": "B", "Mall": "B"},
+    "Gym": {"Park": "W", "Restaurant": "B", "Friend2": "W"},
+    "Mall": {"Cinema": "W", "Restaurant": "W", "Friend2": "B"},
+    "Park": {"Restaurant": "W", "Coffee": "W"},
+    "Restaurant": {"Cinema": "W", "Friend1": "B"},
+    "Friend1": {"Friend2": "M", "Work": "B"},
+    "Friend2": {"Work": "B", "Cinema": "B"},
+    "Work": {"Coffee": "M", "Cinema": "B"},
+    "Cinema": {"Coffee": "W"},
+    "Coffee": {"Home": "W", "Library": "B", "Park": "W", "Work": "M", "Cinema": "W"}
+}
+
+
+def location_graph():
+    """Q1 location graph as a CSRGraph (labels in g.label_names)"""
+    return from_dict_of_dicts(LOCATIONS)
@@ -0,0 +1,268 @@
+"""
+Vertex connectivity and minimum vertex cuts over a CSRGraph
+
+Local connectivity kappa(s, t) is a max flow in the split graph (every
+vertex v becomes v_in -> v_out with capacity 1, every edge u-w the arcs
+u_out -> w_in and w_out -> u_in with capacity n, so a minimum cut only cuts
+vertex arcs), found by bidirectional BFS augmenting paths that only touch
+the vertices they visit.
+Each flow is given a cutoff - the best cut known so far, or k for the
+k-connectivity test - and stops after that many paths, so pairs that cannot
+improve the answer cost at most `cutoff` searches. When a flow does stop
+short, the exhausted search already marks one side of a minimum cut, and the
+cut is read off it: the value and the cut come from the same pass.
+
+Only the necessary pairs are tried (take whichever list is shorter):
+- Esfahanian-Hakimi: v of minimum degree against its non-neighbours, plus
+  non-adjacent pairs of neighbours of v
+- Even: v_0..v_k against every later vertex, with k the current bound
+
+Usage:
+    vertex_connectivity(g)                       # like Sage's G.vertex_connectivity()
+    k, cut = vertex_connectivity(g, value_only=False)
+    is_k_connected(g, 3)
+"""
+
+import sys
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+
+from cliques import simple_adjacency
+
+
+class SplitNetwork:
+    """Residual network of the split graph; node 2v is v_in, 2v+1 is v_out"""
+
+    def __init__(self, indptr, indices):
+        n = len(indptr) - 1
+        rows = np.repeat(np.arange(n), np.diff(indptr))
+        # Arcs come in pairs (a, a ^ 1): forward, reverse with capacity 0.
+        # Vertex arcs v_in -> v_out have capacity 1, edge arcs n (never saturated)
+        tail = np.empty(2 * (n + len(indices)), dtype=np.int64)
+        head = np.empty_like(tail)
+        tail[0:2 * n:2], head[0:2 * n:2] = 2 * np.arange(n), 2 * np.arange(n) + 1
+        tail[2 * n::2], head[2 * n::2] = 2 * rows + 1, 2 * indices
+        tail[1::2], head[1::2] = head[0::2], tail[0::2]
+        cap = np.zeros(len(tail), dtype=np.int64)
+        cap[0:2 * n:2] = 1
+        cap[2 * n::2] = n
+
+        order = np.argsort(tail, kind='stable')
+        where = np.empty_like(order)
+        where[order] = np.arange(len(order))
+        self.ptr = np.searchsorted(tail[order], np.arange(2 * n + 1)).tolist()
+        self.head = head[order].tolist()
+        self.rev = where[order ^ 1].tolist()
+        self.cap = cap[order].tolist()
+        self.n = n
+
+    def _search(self, source, sink):
+        """
+        Bidirectional BFS in the residual graph.
+
+        Returns (path arcs, None) when sink is reachable; otherwise (None, side)
+        where side is ('source', reached nodes) or ('sink', nodes reaching sink),
+        whichever search ran out first.
+        """
+        ptr, head, rev, cap = self.ptr, self.head, self.rev, self.cap
+        fwd, bwd = {source: -1}, {sink: -1}
+        fwd_frontier, bwd_frontier = [source], [sink]
+        while fwd_frontier and bwd_frontier:
+            if len(fwd_frontier) <= len(bwd_frontier):
+                nxt = []
+                for x in fwd_frontier:
+                    for a in range(ptr[x], ptr[x + 1]):
+                        y = head[a]
+                        if cap[a] and y not in fwd:
+                            fwd[y] = a
+                            if y in bwd:
+                                return self._join(fwd, bwd, y, source, sink), None
+                            nxt.append(y)
+                fwd_frontier = nxt
+            else:
+                nxt = []
+                for y in bwd_frontier:
+                    for a in range(ptr[y], ptr[y + 1]):
+                        x = head[a]
+                        r = rev[a]          # residual arc x -> y
+                        if cap[r] and x not in bwd:
+                            bwd[x] = r
+                            if x in fwd:
+                                return self._join(fwd, bwd, x, source, sink), None
+                            nxt.append(x)
+                bwd_frontier = nxt
+        return None, ('source', fwd) if not fwd_frontier else ('sink', bwd)
+
+    def _join(self, fwd, bwd, meet, source, sink):
+        head, rev = self.head, self.rev
+        path = []
+        y = meet
+        while y != source:
+            a = fwd[y]
+            path.append(a)
+            y = head[rev[a]]
+        y = meet
+        while y != sink:
+            a = bwd[y]
+            path.append(a)
+            y = head[a]
+        return path
+
+    def max_flow(self, s, t, cutoff):
+        """
+        Vertex-disjoint s-t paths, counting at most `cutoff`.
+
+        Returns (flow, cut); cut is the list of vertices separating s from t
+        when the flow stopped short of the cutoff, else None: the vertices
+        whose (saturated) arc v_in -> v_out leaves the side the exhausted
+        search reached. Capacities are restored afterwards, so one network
+        serves every pair.
+        """
+        cap, rev = self.cap, self.rev
+        touched = []
+        flow, cut = 0, None
+        while flow < cutoff:
+            path, side = self._search(2 * s + 1, 2 * t)
+            if path is None:
+                which, nodes = side
+                if which == 'source':
+                    cut = [v for v in range(self.n) if 2 * v in nodes and 2 * v + 1 not in nodes]
+                else:
+                    cut = [v for v in range(self.n) if 2 * v + 1 in nodes and 2 * v not in nodes]
+                break
+            for a in path:
+                cap[a] -= 1
+                cap[rev[a]] += 1
+            touched.append(path)
+            flow += 1
+        for path in touched:
+            for a in path:
+                cap[a] += 1
+                cap[rev[a]] -= 1
+        return flow, cut
+
+
+def _components(indptr, indices):
+    n = len(indptr) - 1
+    A = csr_matrix((np.ones(len(indices)), indices, indptr), shape=(n, n))
+    return connected_components(A, directed=False)
+
+
+def _even_pairs(order, n, bound):
+    """Even's pairs: v_i against every later vertex, for i up to the current bound"""
+    for i in range(n):
+        if i > bound():
+            return
+        for j in range(i + 1, n):
+            yield order[i], order[j]
+
+
+def _eh_pairs(v, nbrs, n):
+    """Esfahanian-Hakimi pairs for a minimum-degree vertex v"""
+    adjacent = set(nbrs)
+    for w in range(n):
+        if w != v and w not in adjacent:
+            yield v, w
+    for i, x in enumerate(nbrs):
+        for y in nbrs[i + 1:]:
+            yield x, y
+
+
+def _min_cut(indptr, indices, cap=None):
+    """
+    (best, cut) over the necessary pairs of a connected graph. Flows are capped
+    at min(best, cap), and the search stops once best < cap, or best == 1.
+    """
+    n = len(indptr) - 1
+    deg = np.diff(indptr)
+    v = int(np.argmin(deg))
+    nbrs = indices[indptr[v]:indptr[v + 1]].tolist()
+    best = int(deg[v])
+    cut = nbrs if best < n - 1 else []
+    limit = best if cap is None else min(best, cap)
+    adjacency = [set(indices[indptr[u]:indptr[u + 1]].tolist()) for u in range(n)]
+    net = SplitNetwork(indptr, indices)
+
+    eh_count = (n - best - 1) + best * (best - 1) // 2
+    even_count = (limit + 1) * n
+    if eh_count <= even_count:
+        pairs = _eh_pairs(v, nbrs, n)
+    else:
+        pairs = _even_pairs(np.argsort(deg, kind='stable').tolist(), n, lambda: min(best, limit))
+
+    for s, t in pairs:
+        if best <= 1 or (cap is not None and best < cap):
+            break
+        if t in adjacency[s]:
+            continue
+        flow, local_cut = net.max_flow(s, t, min(best, limit))
+        if local_cut is not None and flow < best:
+            best, cut = flow, local_cut
+    return best, cut
+
+
+def vertex_connectivity(g, value_only=True):
+    """
+    kappa(G), or (kappa, minimum vertex cut as sorted vertex ids) if value_only is False.
+
+    A complete graph has kappa = n - 1 and no cut (an empty list).
+    """
+    indptr, indices = simple_adjacency(g)
+    if g.n <= 1 or _components(indptr, indices)[0] > 1:
+        return 0 if value_only else (0, [])
+    best, cut = _min_cut(indptr, indices)
+    return best if value_only else (best, sorted(cut))
+
+
+def minimum_vertex_cut(g):
+    """A minimum vertex cut as a list of vertex names"""
+    return [g.names[v] for v in vertex_connectivity(g, value_only=False)[1]]
+
+
+def is_k_connected(g, k):
+    """
+    True if G has more than k vertices and no vertex cut of size < k.
+
+    Every flow is capped at k and the search returns at the first pair
+    joined by fewer than k disjoint paths.
+    """
+    if k <= 0:
+        return True
+    indptr, indices = simple_adjacency(g)
+    if g.n <= k or np.diff(indptr).min() < k:
+        return False
+    if _components(indptr, indices)[0] > 1:
+        return False
+    return k == 1 or _min_cut(indptr, indices, cap=k)[0] >= k
+
+
+def _is_separating(g, cut):
+    """True if removing the vertices in cut leaves G disconnected"""
+    indptr, indices = simple_adjacency(g)
+    keep = np.ones(g.n, dtype=bool)
+    keep[cut] = False
+    rows = np.repeat(np.arange(g.n), np.diff(indptr))
+    mask = keep[rows] & keep[indices]
+    A = csr_matrix((np.ones(int(mask.sum())), (rows[mask], indices[mask])), shape=(g.n, g.n))
+    labels = connected_components(A, directed=False)[1][keep]
+    return len(np.unique(labels)) > 1
+
+
+if __name__ == '__main__':
+    # Regression check against networkx: every returned cut disconnects G and has kappa vertices
+    import networkx as nx
+
+    from csr_graph import build_csr
+
+    trials = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    for seed in range(trials):
+        G = nx.relaxed_caveman_graph(2, 5, 0.3, seed=seed) if seed % 2 else nx.gnp_random_graph(12, 0.35, seed=seed)
+        src, dst = zip(*G.edges()) if G.number_of_edges() else ((), ())
+        g = build_csr(list(G.nodes()), np.array(src, dtype=np.int64), np.array(dst, dtype=np.int64))
+        k, cut = vertex_connectivity(g, value_only=False)
+        assert k == nx.node_connectivity(G), (seed, k)
+        if k and k < g.n - 1:
+            assert len(cut) == k and _is_separating(g, cut), (seed, k, cut)
+    print(f"{trials} graphs: connectivity and cuts OK")
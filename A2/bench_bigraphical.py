@@ -0,0 +1,64 @@
+"""
+Benchmark: batched vs per-pair bi-graphical testing
+
+Generates random (S1, S2) pairs with equal sums, runs the per-pair
+is_bigraphical used by q2_solution() and the NumPy batch version, checks that
+they agree and prints the timings.
+
+Usage:
+    python bench_bigraphical.py [--pairs N] [--r R] [--s S] [--max-degree D] [--seed SEED]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from bigraphical import is_bigraphical
+from bigraphical_batch import is_bigraphical_batch
+
+
+def random_pairs(n_pairs, r, s, max_degree, seed=0):
+    """Random padded degree arrays; about half the rows get equal sums"""
+    rng = np.random.default_rng(seed)
+    S1 = rng.integers(0, min(max_degree, s) + 1, size=(n_pairs, r))
+    S2 = rng.integers(0, min(max_degree, r) + 1, size=(n_pairs, s))
+    # Push the sum difference into S2 where it fits, so plenty of pairs pass
+    diff = S1.sum(axis=1) - S2.sum(axis=1)
+    for j in range(s):
+        room = np.clip(np.minimum(diff, r - S2[:, j]), -S2[:, j], None)
+        S2[:, j] += room
+        diff -= room
+    return S1, S2
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pairs', type=int, default=200_000)
+    parser.add_argument('--r', type=int, default=8)
+    parser.add_argument('--s', type=int, default=10)
+    parser.add_argument('--max-degree', type=int, default=8)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    S1, S2 = random_pairs(args.pairs, args.r, args.s, args.max_degree, args.seed)
+    print(f"{args.pairs} pairs, |S1|={args.r}, |S2|={args.s}, max degree {args.max_degree}")
+
+    t0 = time.perf_counter()
+    ok, first = is_bigraphical_batch(S1, S2)
+    t_batch = time.perf_counter() - t0
+
+    rows1, rows2 = S1.tolist(), S2.tolist()
+    t0 = time.perf_counter()
+    expected = [is_bigraphical(a, b) for a, b in zip(rows1, rows2)]
+    t_loop = time.perf_counter() - t0
+
+    agree = bool((ok == np.array(expected)).all())
+    print(f"  bi-graphical: {int(ok.sum())} / {args.pairs}")
+    print(f"  per-pair is_bigraphical: {t_loop:.3f} s ({1e6 * t_loop / args.pairs:.2f} us/pair)")
+    print(f"  is_bigraphical_batch:    {t_batch:.3f} s ({1e6 * t_batch / args.pairs:.2f} us/pair)")
+    print(f"  speed-up: {t_loop / t_batch:.1f}x, results agree: {agree}")
+
+
+if __name__ == '__main__':
+    main()
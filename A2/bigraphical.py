@@ -0,0 +1,145 @@
+"""
+Bi-graphical sequence test (Gale-Ryser)
+
+A pair of sequences S1 = (a_1, ..., a_r), S2 = (b_1, ..., b_s) is bi-graphical
+iff sum(S1) == sum(S2) and, with S1 sorted non-increasingly and b* the
+conjugate of S2 (b*_k = #{j : b_j >= k}),
+
+    a_1 + ... + a_k <= b*_1 + ... + b*_k    for every k = 1, ..., r.
+
+Everything here is iterative and uses counting sort + prefix sums, so the
+plain test runs in O(r + s + max degree) with no recursion limit.
+
+Usage:
+    from bigraphical import is_bigraphical
+    is_bigraphical([8, 6, 4, 4, 4, 4, 4], [6, 5, 4, 4, 4, 4, 3, 3, 1])
+"""
+
+
+def counting_sort_desc(seq, max_value=None):
+    """Sort non-negative integers in non-increasing order in O(n + max)"""
+    if max_value is None:
+        max_value = max(seq, default=0)
+    counts = [0] * (max_value + 1)
+    for d in seq:
+        counts[d] += 1
+    out = []
+    for d in range(max_value, -1, -1):
+        if counts[d]:
+            out.extend([d] * counts[d])
+    return out
+
+
+def conjugate_sequence(seq, length):
+    """Conjugate of a degree sequence: entry k-1 is #{d in seq : d >= k}, k = 1..length"""
+    counts = [0] * (length + 2)
+    for d in seq:
+        counts[min(d, length + 1)] += 1
+    conj = [0] * length
+    at_least = counts[length + 1]
+    for k in range(length, 0, -1):
+        at_least += counts[k]
+        conj[k - 1] = at_least
+    return conj
+
+
+def gale_ryser_violation(S1, S2):
+    """
+    Index of the first failing Gale-Ryser inequality, or -1 if the pair is bi-graphical.
+
+    The index k (0-based) means the prefix a_1 + ... + a_{k+1} of sorted S1 is larger
+    than the matching prefix of the conjugate of S2. A sum mismatch that no prefix
+    inequality catches is reported as len(S1); negative degrees are reported as 0.
+    """
+    r, s = len(S1), len(S2)
+    if any(d < 0 for d in S1) or any(d < 0 for d in S2):
+        return 0
+    if (r == 0) != (s == 0):
+        return 0
+    max_a = max(S1, default=0)
+    if max_a > s:
+        # a_1 > s already breaks the first inequality (b*_1 <= s)
+        return 0
+    a = counting_sort_desc(S1, max_a)
+    conj = conjugate_sequence(S2, r)
+    lhs = rhs = 0
+    for k in range(r):
+        lhs += a[k]
+        rhs += conj[k]
+        if lhs > rhs:
+            return k
+    if lhs != sum(S2):
+        return r
+    return -1
+
+
+def _print_reduction(S1, S2):
+    """Print the same step-by-step reduction trace as the recursive version and return its verdict"""
+    S1 = sorted(S1, reverse=True)
+    S2 = sorted(S2, reverse=True)
+    if sum(S1) != sum(S2):
+        print(f"  Sum mismatch: sum(S1)={sum(S1)}, sum(S2)={sum(S2)}")
+        return False
+    if any(d < 0 for d in S1 + S2):
+        print("  Negative degree")
+        return False
+
+    i = 0
+    while True:
+        r, s = len(S1) - i, len(S2)
+        if r == 0 and s == 0:
+            return True
+        if r == 0 or s == 0:
+            print("  One side empty, other non-empty")
+            return False
+
+        a1, b1 = S1[i], S2[0]
+        if r == 1:
+            return a1 <= s and b1 <= 1
+        if s == 1:
+            return b1 <= r and a1 <= 1
+
+        if a1 > s:
+            print(f"  a1={a1} > s={s}")
+            return False
+        if b1 > r:
+            print(f"  b1={b1} > r={r}")
+            return False
+        if a1 == 0:
+            i += 1
+            continue
+
+        # Subtract 1 from the a1 largest entries of S2 while keeping it sorted:
+        # inside the run of values equal to S2[a1-1], decrement its tail instead
+        # of its head, so no re-sort is needed.
+        v = S2[a1 - 1]
+        if v == 0:
+            print("  Reduction gives negative degree")
+            return False
+        lo = a1 - 1
+        while lo > 0 and S2[lo - 1] == v:
+            lo -= 1
+        hi = a1
+        while hi < s and S2[hi] == v:
+            hi += 1
+        for j in range(lo):
+            S2[j] -= 1
+        for j in range(hi - (a1 - lo), hi):
+            S2[j] -= 1
+
+        i += 1
+        print(f"  Reduce: S1'={S1[i:]}, S2'={S2}")
+
+
+def is_bigraphical(S1, S2, verbose=False):
+    """
+    Determine if the pair (S1, S2) is bi-graphical.
+
+    With verbose=True the Havel-Hakimi style reduction from the proposition is
+    printed step by step (iteratively); otherwise the Gale-Ryser test is used.
+    """
+    if verbose:
+        return _print_reduction(S1, S2)
+    if sum(S1) != sum(S2):
+        return False
+    return gale_ryser_violation(S1, S2) == -1
@@ -0,0 +1,117 @@
+"""
+Batched bi-graphical test with NumPy
+
+Checks many (S1, S2) pairs at once with the Gale-Ryser test from bigraphical.py,
+using only vectorized sort / bincount / cumsum / comparisons.
+
+Input layouts:
+- padded: 2-D integer arrays of shape (N, R) and (N, S), one pair per row,
+  padded with zeros; pass lengths1 / lengths2 if rows have different lengths
+- ragged (CSR style): an offsets array of length N+1 and a flat values array
+  per side, see from_ragged()
+
+Usage:
+    ok, first_fail = is_bigraphical_batch(S1, S2)
+"""
+
+import numpy as np
+
+DEFAULT_CHUNK = 1 << 16
+
+
+def from_ragged(offsets, values):
+    """
+    Convert a CSR-style ragged layout to (padded array, lengths): row i is
+    values[offsets[i]:offsets[i + 1]], so offsets starts at 0, never
+    decreases and ends at most at len(values).
+    """
+    offsets = np.asarray(offsets, dtype=np.int64)
+    values = np.asarray(values, dtype=np.int64)
+    if offsets.ndim != 1 or len(offsets) == 0 or offsets[0] != 0:
+        raise ValueError("offsets must be a non-empty 1-D array starting at 0")
+    lengths = np.diff(offsets)
+    if (lengths < 0).any():
+        raise ValueError("offsets must be non-decreasing")
+    if offsets[-1] > len(values):
+        raise ValueError(f"offsets end at {int(offsets[-1])} but there are only {len(values)} values")
+    n = len(lengths)
+    width = int(lengths.max()) if n else 0
+    padded = np.zeros((n, width), dtype=np.int64)
+    rows = np.repeat(np.arange(n), lengths)
+    cols = np.arange(offsets[-1]) - np.repeat(offsets[:-1], lengths)
+    padded[rows, cols] = values[:offsets[-1]]
+    return padded, lengths
+
+
+def _conjugate_rows(B, width):
+    """Row-wise conjugate: out[i, k-1] = #{j : B[i, j] >= k} for k = 1..width"""
+    n = B.shape[0]
+    clipped = np.minimum(B, width)
+    idx = clipped + (width + 1) * np.arange(n)[:, None]
+    counts = np.bincount(idx.ravel(), minlength=n * (width + 1)).reshape(n, width + 1)
+    return np.cumsum(counts[:, :0:-1], axis=1)[:, ::-1]
+
+
+def _check_chunk(A, B, len1, len2):
+    n, width = A.shape
+    ok = np.ones(n, dtype=bool)
+    first = np.full(n, -1, dtype=np.int64)
+
+    bad = (A < 0).any(axis=1) | (B < 0).any(axis=1) | ((len1 == 0) != (len2 == 0))
+    A = np.where(A < 0, 0, A)
+    B = np.where(B < 0, 0, B)
+
+    if width:
+        lhs = np.cumsum(-np.sort(-A, axis=1), axis=1)
+        rhs = np.cumsum(_conjugate_rows(B, width), axis=1)
+        viol = lhs > rhs
+        has_viol = viol.any(axis=1)
+        first[has_viol] = viol.argmax(axis=1)[has_viol]
+        ok &= ~has_viol
+
+    sums_differ = A.sum(axis=1) != B.sum(axis=1)
+    mismatch_only = sums_differ & ok
+    first[mismatch_only] = len1[mismatch_only]
+    ok &= ~sums_differ
+
+    first[bad] = 0
+    ok &= ~bad
+    return ok, first
+
+
+def is_bigraphical_batch(S1, S2, lengths1=None, lengths2=None, chunk_size=DEFAULT_CHUNK):
+    """
+    Test every row pair (S1[i], S2[i]) for being bi-graphical.
+
+    Returns (ok, first_fail): a boolean vector, and for each pair the index of
+    the first failing Gale-Ryser inequality (-1 if none), with the same
+    conventions as bigraphical.gale_ryser_violation. Rows are processed in
+    chunks of chunk_size to bound memory.
+    """
+    S1 = np.atleast_2d(np.asarray(S1, dtype=np.int64))
+    S2 = np.atleast_2d(np.asarray(S2, dtype=np.int64))
+    n = S1.shape[0]
+    if S2.shape[0] != n:
+        raise ValueError(f"S1 has {n} rows but S2 has {S2.shape[0]}")
+
+    len1 = np.full(n, S1.shape[1], dtype=np.int64) if lengths1 is None else np.asarray(lengths1, dtype=np.int64)
+    len2 = np.full(n, S2.shape[1], dtype=np.int64) if lengths2 is None else np.asarray(lengths2, dtype=np.int64)
+    # Anything past a row's length is padding and must not count
+    if lengths1 is not None:
+        S1 = np.where(np.arange(S1.shape[1]) < len1[:, None], S1, 0)
+    if lengths2 is not None:
+        S2 = np.where(np.arange(S2.shape[1]) < len2[:, None], S2, 0)
+
+    ok = np.empty(n, dtype=bool)
+    first = np.empty(n, dtype=np.int64)
+    for lo in range(0, n, chunk_size):
+        hi = min(lo + chunk_size, n)
+        ok[lo:hi], first[lo:hi] = _check_chunk(S1[lo:hi], S2[lo:hi], len1[lo:hi], len2[lo:hi])
+    return ok, first
+
+
+def is_bigraphical_ragged(offsets1, values1, offsets2, values2, chunk_size=DEFAULT_CHUNK):
+    """Same as is_bigraphical_batch, for CSR-style ragged inputs"""
+    S1, len1 = from_ragged(offsets1, values1)
+    S2, len2 = from_ragged(offsets2, values2)
+    return is_bigraphical_batch(S1, S2, len1, len2, chunk_size)
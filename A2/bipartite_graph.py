@@ -5,6 +5,10 @@ import matplotlib
 matplotlib.use('Agg')  # 不弹窗，只保存图片
 import networkx as nx
 import matplotlib.pyplot as plt
+
+from bipartite_realizer import realize_bipartite_graph
+from degree_sequences import degrees
+
 # 支持中文显示（Windows 常用字体）
 plt.rcParams['font.sans-serif'] = ['Microsoft YaHei', 'SimHei', 'DejaVu Sans']
 plt.rcParams['axes.unicode_minus'] = False
@@ -15,8 +19,8 @@ degrees_S1 = [8, 6, 4, 4, 4, 4, 4]
 # S2: 右边 9 个点
 degrees_S2 = [6, 5, 4, 4, 4, 4, 3, 3, 1]
 
-# 用二分图配置模型生成满足度数序列的图（保留多重边以保证度数精确）
-G = nx.bipartite.configuration_model(degrees_S1, degrees_S2)
+# 按 is_bigraphical 的约化步骤确定性地构造简单二分图（无重边，度数精确）
+G = realize_bipartite_graph(degrees_S1, degrees_S2)
 # 确定左右节点：前 7 个为 S1，后 9 个为 S2
 S1_nodes = list(range(7))
 S2_nodes = list(range(7, 7 + 9))
@@ -53,5 +57,6 @@ plt.tight_layout()
 plt.savefig('bipartite_graph.png', dpi=150, bbox_inches='tight')
 print('图已保存为 bipartite_graph.png')
 # plt.show()  # 若在交互环境需要显示可取消注释
-print('S1 度数:', degrees_S1, '→ 实际度数:', [G.degree(i) for i in S1_nodes])
-print('S2 度数:', degrees_S2, '→ 实际度数:', [G.degree(i) for i in S2_nodes])
+actual = degrees(G)
+print('S1 度数:', degrees_S1, '→ 实际度数:', actual[S1_nodes].tolist())
+print('S2 度数:', degrees_S2, '→ 实际度数:', actual[S2_nodes].tolist())
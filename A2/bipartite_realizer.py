@@ -0,0 +1,122 @@
+"""
+Deterministic realization of a bi-graphical pair as a simple bipartite graph
+
+Follows the same reduction as is_bigraphical: each left vertex (largest degree
+first) is joined to the right vertices with the largest remaining degrees.
+Right vertices sit in buckets by remaining degree, and the non-empty buckets
+form a linked list, so each step costs O(a_i) and the whole realization O(E).
+
+The result is a pair of NumPy arrays (left, right): edge k joins left vertex
+left[k] (index into S1) and right vertex right[k] (index into S2).
+
+Usage:
+    from bipartite_realizer import realize_bipartite, realize_bipartite_graph
+    left, right = realize_bipartite(S1, S2)
+    G = realize_bipartite_graph(S1, S2)   # NetworkX graph, nodes 0..r+s-1
+"""
+
+import numpy as np
+
+from bigraphical import is_bigraphical
+
+
+def _index_dtype(n):
+    return np.int32 if n < 2**31 else np.int64
+
+
+def realize_bipartite(S1, S2):
+    """Edge arrays (left, right) of a simple bipartite graph with degrees S1, S2"""
+    if not is_bigraphical(S1, S2):
+        raise ValueError("degree sequences are not bi-graphical")
+    r, s = len(S1), len(S2)
+    n_edges = sum(S1)
+    left = np.empty(n_edges, dtype=_index_dtype(r))
+    right = np.empty(n_edges, dtype=_index_dtype(s))
+    if n_edges == 0:
+        return left, right
+
+    max_b = max(S2)
+    bucket = [[] for _ in range(max_b + 1)]
+    for j in range(s - 1, -1, -1):
+        if S2[j] > 0:
+            bucket[S2[j]].append(j)
+
+    # Linked list of non-empty bucket degrees, highest first.
+    # head = max_b + 1, 0 terminates the list (degree-0 vertices are dropped).
+    head = max_b + 1
+    nxt = [0] * (max_b + 2)
+    prev = head
+    for d in range(max_b, 0, -1):
+        if bucket[d]:
+            nxt[prev] = d
+            prev = d
+
+    # Left vertices by non-increasing degree, ties in input order
+    by_degree = [[] for _ in range(max(S1) + 1)]
+    for i, a in enumerate(S1):
+        by_degree[a].append(i)
+    order = [i for a in range(len(by_degree) - 1, -1, -1) for i in by_degree[a]]
+
+    pos = 0
+    for i in order:
+        a = S1[i]
+        if a == 0:
+            break
+        # Take the a right vertices of largest remaining degree
+        groups = []
+        need = a
+        d = nxt[head]
+        while need:
+            if d == 0:
+                raise ValueError("degree sequences are not bi-graphical")
+            b = bucket[d]
+            if len(b) <= need:
+                verts = b
+                bucket[d] = []
+            else:
+                verts = b[len(b) - need:]
+                del b[len(b) - need:]
+            need -= len(verts)
+            groups.append((d, verts))
+            d = nxt[d]
+        rest = d
+
+        left[pos:pos + a] = i
+        for d, verts in groups:
+            right[pos:pos + len(verts)] = verts
+            pos += len(verts)
+            if d > 1:
+                bucket[d - 1].extend(verts)
+
+        # Relink the touched part of the list: degrees d and d-1 of every group
+        touched = []
+        for d, _ in groups:
+            for t in (d, d - 1):
+                if t > 0 and (not touched or touched[-1] != t):
+                    touched.append(t)
+        prev = head
+        for t in touched:
+            if bucket[t]:
+                nxt[prev] = t
+                prev = t
+        if touched[-1] != rest:
+            nxt[prev] = rest
+
+    return left, right
+
+
+def to_networkx(left, right, r, s):
+    """NetworkX graph from edge arrays; left vertices are 0..r-1, right vertices r..r+s-1"""
+    import networkx as nx
+
+    G = nx.Graph()
+    G.add_nodes_from(range(r), bipartite=0)
+    G.add_nodes_from(range(r, r + s), bipartite=1)
+    G.add_edges_from(zip(left.tolist(), (right + r).tolist()))
+    return G
+
+
+def realize_bipartite_graph(S1, S2):
+    """Simple bipartite NetworkX graph with degrees S1 (nodes 0..r-1) and S2 (nodes r..r+s-1)"""
+    left, right = realize_bipartite(S1, S2)
+    return to_networkx(left, right, len(S1), len(S2))
@@ -0,0 +1,224 @@
+"""
+Span tracing for the document build
+
+A span is a named, timed section of the build (one question, one
+save_figure() call, the markdown conversion, write_pdf, ...). Each span
+records wall time, CPU time of its process and the process's peak RSS when
+it closed, plus counters such as figures written and their size in bytes;
+counters of nested spans are added to their parents.
+
+Tracing is off by default. Then span() returns one shared no-op context
+manager and nothing is measured or stored, so the instrumented code pays a
+single global lookup per span. Functions registered with instrument() (e.g.
+nx.spring_layout) are only wrapped while tracing is on.
+
+Questions rendered in worker processes are traced in the worker (see
+render_pipeline.py) and their spans merged into the parent's trace, so one
+trace shows every process on its own row.
+
+Usage:
+    build_trace.enable()
+    with build_trace.span('markdown') as s:
+        html = markdown.markdown(text)
+        s.add(html_bytes=len(html))
+    build_trace.report()                            # summary table by span name
+    build_trace.write_chrome_trace('build_trace.json')   # chrome://tracing, Perfetto
+"""
+
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:         # Windows: no getrusage, peak RSS is not reported
+    resource = None
+
+# Finished spans while tracing is on, else None; _pid is the process that enabled it
+_events = None
+_pid = None
+_stack = []
+# (owner, attribute name) pairs wrapped while tracing is on, see instrument()
+_instrumented = []
+_originals = []
+
+
+class _NullSpan:
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL = _NullSpan()
+
+
+def _peak_rss():
+    """Peak resident set size of this process in bytes, or None"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class Span:
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+        self.counts = {}
+
+    def add(self, **counts):
+        """Add to this span's counters (figures=1, figure_bytes=..., ...)"""
+        for key, value in counts.items():
+            self.counts[key] = self.counts.get(key, 0) + value
+
+    def __enter__(self):
+        _stack.append(self)
+        self.cpu = time.process_time()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self.start
+        cpu = time.process_time() - self.cpu
+        if _stack and _stack[-1] is self:
+            _stack.pop()
+        if _stack:
+            _stack[-1].add(**self.counts)
+        if _events is not None:
+            _events.append({'name': self.name, 'start': self.start, 'wall': wall, 'cpu': cpu,
+                            'peak_rss': _peak_rss(), 'pid': os.getpid(),
+                            'tid': threading.get_ident(), 'args': self.args, 'counts': self.counts})
+        return False
+
+
+def span(name, **args):
+    """Context manager timing one section; yields the Span (None when tracing is off)"""
+    if _events is None:
+        return _NULL
+    return Span(name, args)
+
+
+def enabled():
+    return _events is not None
+
+
+def instrument(owner, *names):
+    """Trace owner.<name>(...) calls as spans of that name, while tracing is on"""
+    for name in names:
+        _instrumented.append((owner, name))
+        if _events is not None:
+            _patch(owner, name)
+
+
+def _patch(owner, name):
+    func = getattr(owner, name)
+
+    @functools.wraps(func)
+    def traced(*args, **kwargs):
+        with span(name):
+            return func(*args, **kwargs)
+
+    _originals.append((owner, name, func))
+    setattr(owner, name, traced)
+
+
+def enable():
+    """Start a new trace in this process"""
+    global _events, _pid
+    if _events is None:
+        for owner, name in _instrumented:
+            _patch(owner, name)
+    _events = []
+    _pid = os.getpid()
+    _stack.clear()
+
+
+def disable():
+    """Stop tracing; returns the finished spans"""
+    global _events
+    events, _events = _events or [], None
+    while _originals:
+        owner, attr, func = _originals.pop()
+        setattr(owner, attr, func)
+    _stack.clear()
+    return events
+
+
+@contextlib.contextmanager
+def worker(trace):
+    """
+    Trace a job in a worker process: yields the list its spans end up in.
+    Empty if trace is false or the job runs in the tracing process itself
+    (its spans then go straight into the trace). A forked worker inherits a
+    copy of the parent's trace, which is started afresh.
+    """
+    if not trace or (_events is not None and _pid == os.getpid()):
+        yield []
+        return
+    enable()
+    events = _events
+    try:
+        yield events
+    finally:
+        disable()
+
+
+def merge(events):
+    """Add spans recorded in another process to this trace"""
+    if _events is not None and events:
+        _events.extend(events)
+
+
+def summary(events=None):
+    """One row per span name in first-seen order: calls, wall / CPU seconds, peak RSS, counters"""
+    rows = {}
+    for e in sorted(events if events is not None else (_events or []), key=lambda e: e['start']):
+        row = rows.setdefault(e['name'], {'name': e['name'], 'calls': 0, 'wall': 0.0, 'cpu': 0.0,
+                                          'peak_rss': None, 'counts': {}})
+        row['calls'] += 1
+        row['wall'] += e['wall']
+        row['cpu'] += e['cpu']
+        if e['peak_rss'] is not None:
+            row['peak_rss'] = max(row['peak_rss'] or 0, e['peak_rss'])
+        for key, value in e['counts'].items():
+            row['counts'][key] = row['counts'].get(key, 0) + value
+    return list(rows.values())
+
+
+def report(events=None, file=None):
+    """Print the summary table"""
+    rows = summary(events)
+    if not rows:
+        return
+    out = file or sys.stdout
+    print(f"\n{'span':24s} {'calls':>6s} {'wall s':>9s} {'cpu s':>9s} {'peak RSS':>10s}  counters", file=out)
+    for r in rows:
+        rss = '-' if r['peak_rss'] is None else f"{r['peak_rss'] / 2**20:.0f} MiB"
+        counts = ', '.join(f"{k}={v}" for k, v in sorted(r['counts'].items()))
+        print(f"{r['name']:24s} {r['calls']:6d} {r['wall']:9.3f} {r['cpu']:9.3f} {rss:>10s}  {counts}",
+              file=out)
+
+
+def write_chrome_trace(path, events=None):
+    """Write the spans as Chrome trace-event JSON ("X" events, microseconds from the first span)"""
+    events = events if events is not None else (_events or [])
+    origin = min((e['start'] for e in events), default=0.0)
+    trace = []
+    for e in events:
+        args = dict(e['args'], cpu_ms=round(1e3 * e['cpu'], 3), **e['counts'])
+        if e['peak_rss'] is not None:
+            args['peak_rss_mib'] = round(e['peak_rss'] / 2**20, 1)
+        trace.append({'name': e['name'], 'cat': 'build', 'ph': 'X', 'pid': e['pid'], 'tid': e['tid'],
+                      'ts': round(1e6 * (e['start'] - origin), 1), 'dur': round(1e6 * e['wall'], 1),
+                      'args': args})
+    path = Path(path)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': trace, 'displayTimeUnit': 'ms'}, f)
+    return path
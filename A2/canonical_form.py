@@ -0,0 +1,276 @@
+"""
+Canonical forms for isomorphism testing and deduplication
+
+Two graphs are isomorphic exactly when their certificates are equal, so
+"is this graph isomorphic to anything seen so far?" is one dict lookup
+(IsomorphismIndex) instead of a VF2 call per stored graph.
+
+- trees: AHU encoding, rooted at the centre. Levels are processed bottom-up
+  and each vertex gets the rank of its sorted tuple of child codes, so the
+  certificate is the per-level multiset of those tuples.
+- other graphs: colour refinement (1-WL) to an equitable partition, then
+  individualization-refinement: split the first non-singleton cell on each
+  of its vertices, refine again, and keep the smallest relabelled edge list
+  over the leaves. Two leaves with the same edge list give an automorphism:
+  the search jumps back to the node where their paths split (the rest of
+  that branch is an image of one already searched), and the automorphism is
+  kept as a generator if it joins orbits there. Each node computes its
+  orbits once and prunes children in the same orbit, so symmetric graphs
+  stay cheap: K_30 and the empty graph on 40 vertices take about 0.2 s,
+  K_60 1.5 s, the Petersen graph a millisecond.
+
+Usage:
+    certificate(G) == certificate(H)        # isomorphism test
+    index = IsomorphismIndex()
+    first, is_new = index.add(T, name)      # first graph seen in T's class
+"""
+
+import hashlib
+
+import networkx as nx
+
+
+def _adjacency(G):
+    if G.is_directed():
+        raise ValueError("canonical forms are implemented for undirected graphs")
+    nodes = list(G.nodes())
+    index = {v: i for i, v in enumerate(nodes)}
+    adj = [[] for _ in nodes]
+    loops = [False] * len(nodes)
+    for u, v in G.edges():
+        if u == v:
+            loops[index[u]] = True
+        else:
+            adj[index[u]].append(index[v])
+            adj[index[v]].append(index[u])
+    return nodes, adj, loops
+
+
+def refine(adj, colours):
+    """Colour refinement to the coarsest equitable partition; colours are ranks, so the result is canonical"""
+    n_colours = len(set(colours))
+    while True:
+        sig = [(colours[v], tuple(sorted(colours[u] for u in adj[v]))) for v in range(len(adj))]
+        rank = {s: i for i, s in enumerate(sorted(set(sig)))}
+        colours = [rank[s] for s in sig]
+        if len(rank) == n_colours:
+            return colours
+        n_colours = len(rank)
+
+
+def _individualize(colours, v):
+    sig = [(c, u != v) for u, c in enumerate(colours)]
+    rank = {s: i for i, s in enumerate(sorted(set(sig)))}
+    return [rank[s] for s in sig]
+
+
+class _Search:
+    """Individualization-refinement tree with automorphism (orbit) pruning"""
+
+    def __init__(self, adj, loops):
+        self.adj = adj
+        self.edges = [(u, v) for u in range(len(adj)) for v in adj[u] if u < v]
+        self.edges += [(u, u) for u in range(len(adj)) if loops[u]]
+        self.best = self.best_lab = self.best_path = None
+        self.first = self.first_lab = self.first_path = None
+        self.generators = []
+
+    def _leaf(self, lab, path):
+        """
+        Record a leaf. Returns the depth to jump back to when the leaf is
+        equivalent to the first or best leaf, else None.
+        """
+        cert = tuple(sorted((min(lab[u], lab[v]), max(lab[u], lab[v])) for u, v in self.edges))
+        if self.first is None:
+            self.first, self.first_lab, self.first_path = cert, lab, path
+        for known, known_lab, known_path in ((self.first, self.first_lab, self.first_path),
+                                             (self.best, self.best_lab, self.best_path)):
+            if cert == known and lab != known_lab:
+                inverse = {p: u for u, p in enumerate(known_lab)}
+                gamma = [inverse[p] for p in lab]
+                level = 0
+                while path[level] == known_path[level]:
+                    level += 1
+                # gamma fixes the common prefix; keep it only if it adds to the orbits there
+                find = self._orbits(path[:level])
+                if any(find(v) != find(w) for v, w in enumerate(gamma)):
+                    self.generators.append(gamma)
+                return level
+        if self.best is None or cert < self.best:
+            self.best, self.best_lab, self.best_path = cert, lab, path
+        return None
+
+    def _orbits(self, prefix, parent=None, start=0):
+        """
+        Union-find over the orbits of the stored generators (from index
+        start on) that fix prefix pointwise; returns find.
+        """
+        if parent is None:
+            parent = list(range(len(self.adj)))
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        for gamma in self.generators[start:]:
+            if all(gamma[v] == v for v in prefix):
+                for v, w in enumerate(gamma):
+                    a, b = find(v), find(w)
+                    if a != b:
+                        parent[max(a, b)] = min(a, b)
+        return find
+
+    def run(self, colours, prefix=()):
+        """Search below this node; returns a depth to jump back to, or None"""
+        colours = refine(self.adj, colours)
+        counts = {}
+        for c in colours:
+            counts[c] = counts.get(c, 0) + 1
+        cells = [c for c in sorted(counts) if counts[c] > 1]
+        if not cells:
+            return self._leaf(colours, prefix)
+        target = cells[0]
+        parent = list(range(len(self.adj)))
+        seen = 0
+        done = []
+        for v in [u for u, c in enumerate(colours) if c == target]:
+            # Orbits of this node, extended by the generators found since the last child
+            find = self._orbits(prefix, parent, seen)
+            seen = len(self.generators)
+            if any(find(v) == find(u) for u in done):
+                continue
+            jump = self.run(_individualize(colours, v), prefix + (v,))
+            done.append(v)
+            if jump is not None and jump < len(prefix):
+                return jump
+        return None
+
+
+def _canonical(adj, loops):
+    search = _Search(adj, loops)
+    search.run([int(x) for x in loops])
+    return ('graph', len(adj), search.best or ()), search.best_lab or [], search
+
+
+def adjacency_certificate(adj, loops=None):
+    """Certificate of a graph on 0..n-1 given as neighbour lists (loops[v]: v has a self-loop)"""
+    return _canonical(adj, loops or [False] * len(adj))[0]
+
+
+def adjacency_labeling(adj):
+    """
+    (certificate, canonical position of each vertex, orbits) of a loopless
+    graph on 0..n-1. Vertices with equal orbits[v] are mapped onto each
+    other by an automorphism found during the search; the found ones need
+    not generate every automorphism, so unequal entries prove nothing.
+    """
+    cert, lab, search = _canonical(adj, [False] * len(adj))
+    find = search._orbits(())
+    return cert, lab, [find(v) for v in range(len(adj))]
+
+
+def canonical_labeling(G):
+    """(certificate, {node: canonical position}) for a general undirected graph"""
+    nodes, adj, loops = _adjacency(G)
+    cert, lab, _ = _canonical(adj, loops)
+    return cert, {v: lab[i] for i, v in enumerate(nodes)}
+
+
+def _tree_centres(adj):
+    n = len(adj)
+    if n <= 2:
+        return list(range(n))
+    degree = [len(a) for a in adj]
+    leaves = [v for v in range(n) if degree[v] == 1]
+    remaining = n
+    while remaining > 2:
+        remaining -= len(leaves)
+        nxt = []
+        for v in leaves:
+            for u in adj[v]:
+                degree[u] -= 1
+                if degree[u] == 1:
+                    nxt.append(u)
+        leaves = nxt
+    return leaves
+
+
+def _rooted_tree_code(adj, root):
+    levels = [[root]]
+    parent = {root: None}
+    while True:
+        nxt = [u for v in levels[-1] for u in adj[v] if u not in parent]
+        for v in levels[-1]:
+            for u in adj[v]:
+                if u not in parent:
+                    parent[u] = v
+        if not nxt:
+            break
+        levels.append(nxt)
+
+    code = {}
+    out = []
+    for level in reversed(levels):
+        children = {v: [] for v in level}
+        for v in level:
+            for u in adj[v]:
+                if u in code and parent[u] == v:
+                    children[v].append(code[u])
+        sig = {v: tuple(sorted(children[v])) for v in level}
+        rank = {s: i for i, s in enumerate(sorted(set(sig.values())))}
+        for v in level:
+            code[v] = rank[sig[v]]
+        out.append(tuple(sorted(sig.values())))
+    return tuple(out)
+
+
+def tree_certificate(G):
+    """AHU certificate of a tree (taken over both centres when there are two)"""
+    _, adj, _ = _adjacency(G)
+    codes = [_rooted_tree_code(adj, c) for c in _tree_centres(adj)]
+    return ('tree', len(adj), min(codes) if codes else ())
+
+
+def certificate(G):
+    """Hashable canonical certificate: equal for two graphs exactly when they are isomorphic"""
+    if G.number_of_nodes() > 0 and not G.is_directed() and nx.is_tree(G):
+        return tree_certificate(G)
+    return canonical_labeling(G)[0]
+
+
+def certificate_digest(G):
+    """SHA-256 hex digest of certificate(G), a compact key for large collections"""
+    return hashlib.sha256(repr(certificate(G)).encode('utf-8')).hexdigest()
+
+
+def are_isomorphic(G, H):
+    if G.number_of_nodes() != H.number_of_nodes() or G.number_of_edges() != H.number_of_edges():
+        return False
+    return certificate(G) == certificate(H)
+
+
+class IsomorphismIndex:
+    """Isomorphism classes keyed by certificate digest; each class remembers the first item added"""
+
+    def __init__(self):
+        self._classes = {}
+
+    def __len__(self):
+        return len(self._classes)
+
+    def __contains__(self, G):
+        return certificate_digest(G) in self._classes
+
+    def find(self, G):
+        """The item stored for G's isomorphism class, or None"""
+        return self._classes.get(certificate_digest(G))
+
+    def add(self, G, item=None):
+        """Register G; returns (item stored for its class, True if the class is new)"""
+        key = certificate_digest(G)
+        if key in self._classes:
+            return self._classes[key], False
+        self._classes[key] = G if item is None else item
+        return self._classes[key], True
@@ -0,0 +1,151 @@
+"""
+Lazy complement of a NetworkX graph
+
+nx.complement() builds all n(n-1)/2 - m edges of the complement. For
+"is the complement connected / bipartite?" questions that is never needed:
+
+- ComplementView answers degree / has_edge / neighbors from G's adjacency
+- complement_bfs uses the unvisited-set technique: when v is expanded, each
+  still-unvisited vertex is either reached (and leaves the set for good) or
+  is a neighbour of v in G (charged to that edge), so a whole BFS is O(n + m)
+- complement_is_bipartite: the complement is bipartite iff V splits into two
+  cliques of G. That needs m >= C(ceil(n/2), 2) + C(floor(n/2), 2) - so
+  sparse graphs fail at once - and otherwise a complement BFS 2-colouring
+  plus one O(m) clique check per colour class.
+
+Self-loops of G are ignored, as in nx.complement.
+
+Usage:
+    complement_is_connected(nx.path_graph(10**5))      # True, without the 5e9 edges
+    Gc = ComplementView(G); Gc.degree(v), Gc.number_of_edges()
+"""
+
+import networkx as nx
+
+
+class ComplementView:
+    """Read-only complement of G, computed on demand from G's adjacency"""
+
+    def __init__(self, G):
+        if G.is_directed():
+            raise ValueError("ComplementView is implemented for undirected graphs")
+        self.G = G
+
+    def nodes(self):
+        return self.G.nodes()
+
+    def number_of_nodes(self):
+        return self.G.number_of_nodes()
+
+    def __len__(self):
+        return self.G.number_of_nodes()
+
+    def __contains__(self, v):
+        return v in self.G
+
+    def _g_degree(self, v):
+        nbrs = self.G.adj[v]
+        return len(nbrs) - (v in nbrs)
+
+    def degree(self, v):
+        return self.G.number_of_nodes() - 1 - self._g_degree(v)
+
+    def number_of_edges(self):
+        n = self.G.number_of_nodes()
+        loops = nx.number_of_selfloops(self.G)
+        return n * (n - 1) // 2 - (self.G.number_of_edges() - loops)
+
+    def has_edge(self, u, v):
+        return u != v and u in self.G and v in self.G and v not in self.G.adj[u]
+
+    def neighbors(self, v):
+        nbrs = self.G.adj[v]
+        return (u for u in self.G if u != v and u not in nbrs)
+
+    def edges(self):
+        seen = set()
+        for u in self.G:
+            seen.add(u)
+            nbrs = self.G.adj[u]
+            for v in self.G:
+                if v not in seen and v not in nbrs:
+                    yield u, v
+
+    def to_networkx(self):
+        """Materialize the complement (same as nx.complement(G))"""
+        return nx.complement(self.G)
+
+
+def complement_bfs(G, source, unvisited=None):
+    """
+    Yield (vertex, parent, depth) in BFS order over the complement of G.
+
+    unvisited, if given, is the set of vertices still available; it is
+    shrunk in place, which lets callers run one BFS per component.
+    """
+    if unvisited is None:
+        unvisited = set(G)
+    unvisited.discard(source)
+    adj = G.adj
+    frontier = [source]
+    depth = 0
+    yield source, None, 0
+    while frontier and unvisited:
+        depth += 1
+        nxt = []
+        for v in frontier:
+            nbrs = adj[v]
+            reached = [u for u in unvisited if u not in nbrs]
+            for u in reached:
+                unvisited.discard(u)
+                yield u, v, depth
+            nxt.extend(reached)
+            if not unvisited:
+                return
+        frontier = nxt
+
+
+def complement_components(G):
+    """Connected components of the complement, as a list of sets"""
+    unvisited = set(G)
+    components = []
+    while unvisited:
+        source = next(iter(unvisited))
+        components.append({v for v, _, _ in complement_bfs(G, source, unvisited)})
+    return components
+
+
+def complement_is_connected(G):
+    """Same as nx.is_connected(nx.complement(G)), in O(n + m)"""
+    if G.number_of_nodes() == 0:
+        raise nx.NetworkXPointlessConcept("Connectivity is undefined for the null graph.")
+    source = next(iter(G))
+    reached = sum(1 for _ in complement_bfs(G, source))
+    return reached == G.number_of_nodes()
+
+
+def _is_clique(G, part):
+    size = len(part)
+    for v in part:
+        nbrs = G.adj[v]
+        if sum(1 for u in nbrs if u in part and u != v) != size - 1:
+            return False
+    return True
+
+
+def complement_is_bipartite(G):
+    """Same as nx.is_bipartite(nx.complement(G)), in O(n + m)"""
+    n = G.number_of_nodes()
+    a, b = (n + 1) // 2, n // 2
+    m = G.number_of_edges() - nx.number_of_selfloops(G)
+    if m < a * (a - 1) // 2 + b * (b - 1) // 2:
+        return False
+
+    colour = {}
+    unvisited = set(G)
+    while unvisited:
+        source = next(iter(unvisited))
+        for v, parent, _ in complement_bfs(G, source, unvisited):
+            colour[v] = 0 if parent is None else 1 - colour[parent]
+    parts = ({v for v in colour if colour[v] == 0}, {v for v in colour if colour[v] == 1})
+    return all(_is_clique(G, part) for part in parts)
@@ -0,0 +1,190 @@
+"""
+Degree analytics and graphicality tests for ordinary (non-bipartite) graphs
+
+Degrees are taken straight from an integer-indexed adjacency (the row
+pointer of a CSR matrix, or anything with an indptr), and everything after
+that works on the degree histogram c[v] = #{vertices of degree v}:
+
+- sorting is a counting sort (np.repeat over the histogram)
+- statistics (min / max / mean / variance / median) are O(max degree)
+- Erdos-Gallai: with d sorted non-increasingly, d is graphical iff the sum is
+  even and for every k
+      d_1 + ... + d_k <= k(k - 1) + sum_{i > k} min(d_i, k).
+  Only the k that end a run of equal degrees need checking (Tripathi and
+  Vijay), so with the conjugate p(k) = #{i : d_i >= k} every inequality is
+  evaluated in O(1) and the whole test is O(n + max degree).
+
+Histograms of huge graphs are built chunk by chunk from the row pointer, so
+10^8 vertices never materialize a 10^8-entry degree array.
+
+Havel-Hakimi realization keeps the remaining degrees sorted: the largest is
+joined to the next d, and inside the run of equal values at the boundary
+the tail is decremented instead of the head, so nothing is re-sorted
+(the same trick as the verbose reduction in bigraphical.py).
+
+Usage:
+    from degree_sequences import degree_sequence, degree_summary, is_graphical, realize_graph
+    degree_sequence(G)                      # sorted non-increasing, as a list
+    degree_summary(A)                       # min / max / mean / histogram
+    is_graphical([3, 3, 2, 2, 2]); u, v = havel_hakimi([3, 3, 2, 2, 2])
+"""
+
+import numpy as np
+
+CHUNK = 1 << 24             # row-pointer entries per histogram chunk
+
+
+def degrees(A):
+    """
+    Degree array of a NetworkX graph, a SciPy sparse adjacency or anything
+    with an indptr (CSR row pointer): row lengths, no Python-level iteration.
+    """
+    if hasattr(A, 'nodes'):
+        return np.fromiter((d for _, d in A.degree()), dtype=np.int64, count=A.number_of_nodes())
+    indptr = A.indptr if hasattr(A, 'indptr') else A.tocsr().indptr
+    return np.diff(indptr)
+
+
+def degree_histogram(A, chunk=CHUNK):
+    """c[v] = number of vertices of degree v; from a degree array, or chunked from a CSR row pointer"""
+    if isinstance(A, (list, tuple, np.ndarray)):
+        d = np.asarray(A, dtype=np.int64)
+        if d.size and d.min() < 0:
+            raise ValueError("degrees must be non-negative")
+        return np.bincount(d)
+    if hasattr(A, 'nodes'):
+        return np.bincount(degrees(A))
+    indptr = A.indptr if hasattr(A, 'indptr') else A.tocsr().indptr
+    hist = np.zeros(0, dtype=np.int64)
+    for start in range(0, len(indptr) - 1, chunk):
+        part = np.bincount(np.diff(indptr[start:start + chunk + 1]))
+        if len(part) > len(hist):
+            part[:len(hist)] += hist
+            hist = part
+        else:
+            hist[:len(part)] += part
+    return hist
+
+
+def sort_desc(hist):
+    """Degree sequence, non-increasing, from a histogram (counting sort)"""
+    values = np.arange(len(hist) - 1, -1, -1)
+    return np.repeat(values, hist[::-1])
+
+
+def degree_sequence(G):
+    """Sorted non-increasing degree sequence as a list of ints"""
+    return sort_desc(degree_histogram(G)).tolist()
+
+
+def degree_summary(A):
+    """n, m, min / max / mean / variance / median degree and the histogram, from one pass"""
+    hist = degree_histogram(A)
+    n = int(hist.sum())
+    if n == 0:
+        return {'n': 0, 'm': 0, 'min': 0, 'max': 0, 'mean': 0.0, 'var': 0.0, 'median': 0.0,
+                'histogram': []}
+    values = np.arange(len(hist))
+    total = int((values * hist).sum())
+    mean = total / n
+    present = np.flatnonzero(hist)
+    cum = np.cumsum(hist)
+    lo = int(np.searchsorted(cum, (n - 1) // 2, side='right'))
+    hi = int(np.searchsorted(cum, n // 2, side='right'))
+    return {'n': n, 'm': total // 2, 'min': int(present[0]), 'max': int(present[-1]),
+            'mean': mean, 'var': float((hist * (values - mean) ** 2).sum() / n),
+            'median': (lo + hi) / 2, 'histogram': hist.tolist()}
+
+
+def erdos_gallai_violation(seq):
+    """
+    Smallest k (1-based, a run end of the sorted sequence) whose Erdos-Gallai
+    inequality fails, or -1 if the sequence is graphical. An odd sum or a
+    negative degree is reported as 0.
+    """
+    d = np.asarray(seq, dtype=np.int64)
+    if d.size and d.min() < 0:
+        return 0
+    hist = np.bincount(d)
+    n = len(d)
+    values = np.arange(len(hist), dtype=np.int64)
+    if n == 0:
+        return -1
+    if int((values * hist).sum()) % 2:
+        return 0
+
+    # Runs of equal degrees in non-increasing order: value, end position k, prefix sum through k
+    run_vals = np.flatnonzero(hist)[::-1]
+    run_counts = hist[run_vals]
+    k = np.cumsum(run_counts)
+    prefix = np.cumsum(run_vals * run_counts)
+
+    # p(k) = #{i : d_i >= k}, zero beyond the largest degree
+    at_least = np.cumsum(hist[::-1])[::-1]
+    p = np.where(k < len(hist), at_least[np.minimum(k, len(hist) - 1)], 0)
+
+    # sum_{i > k} min(d_i, k): positions k+1..max(k, p) contribute k each, the rest their own degree
+    j = np.maximum(k, p)
+    group = np.searchsorted(k, j, side='left')          # run containing position j (1-based)
+    before = np.concatenate(([0], k[:-1]))
+    prefix_before = np.concatenate(([0], prefix[:-1]))
+    g = np.minimum(group, len(k) - 1)
+    prefix_j = np.where(group < len(k), prefix_before[g] + (j - before[g]) * run_vals[g], prefix[-1])
+    rhs = k * (k - 1) + k * (j - k) + (prefix[-1] - prefix_j)
+    bad = np.flatnonzero(prefix > rhs)
+    return int(k[bad[0]]) if len(bad) else -1
+
+
+def is_graphical(seq):
+    """True if seq is the degree sequence of a simple graph (Erdos-Gallai)"""
+    return erdos_gallai_violation(seq) == -1
+
+
+def havel_hakimi(seq):
+    """
+    Edge arrays (u, v) of a simple graph whose vertex i has degree seq[i].
+
+    Raises ValueError if the sequence is not graphical.
+    """
+    d = np.asarray(seq, dtype=np.int64)
+    if not is_graphical(d):
+        raise ValueError("degree sequence is not graphical")
+    n = len(d)
+    m = int(d.sum()) // 2
+    u = np.empty(m, dtype=np.int64)
+    v = np.empty(m, dtype=np.int64)
+    # Remaining degrees negated, so the array is ascending and searchsorted applies
+    order = np.argsort(-d, kind='stable')
+    neg = -d[order]
+    pos = 0
+    for i in range(n):
+        a = -int(neg[i])
+        if a == 0:
+            break
+        rest = neg[i + 1:]
+        if a > len(rest):
+            raise ValueError("degree sequence is not graphical")
+        boundary = rest[a - 1]
+        lo = int(np.searchsorted(rest, boundary, side='left'))
+        hi = int(np.searchsorted(rest, boundary, side='right'))
+        tail = a - lo                                   # taken from the end of the boundary run
+        if boundary == 0:
+            raise ValueError("degree sequence is not graphical")
+        u[pos:pos + a] = order[i]
+        v[pos:pos + lo] = order[i + 1:i + 1 + lo]
+        v[pos + lo:pos + a] = order[i + 1 + hi - tail:i + 1 + hi]
+        rest[:lo] += 1
+        rest[hi - tail:hi] += 1
+        pos += a
+    return u, v
+
+
+def realize_graph(seq):
+    """Simple NetworkX graph on 0..n-1 with degree sequence seq (Havel-Hakimi)"""
+    import networkx as nx
+
+    u, v = havel_hakimi(seq)
+    G = nx.Graph()
+    G.add_nodes_from(range(len(seq)))
+    G.add_edges_from(zip(u.tolist(), v.tolist()))
+    return G
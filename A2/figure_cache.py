@@ -0,0 +1,93 @@
+"""
+Content-addressed cache for rendered figures
+
+A figure's key is a SHA-256 over everything that affects the picture: the
+edge lists of the graphs drawn, the layout seed, the style options, the dpi
+and the source of the drawing function. Rendered PNGs are stored as
+<key>.png in the cache directory; on a hit the PNG is copied instead of
+running matplotlib.
+
+After a build, write_manifest() records which key produced each fig_N.png
+(manifest.json) and deletes cached PNGs that the build did not use.
+
+Usage:
+    key = figure_key(G, seed=42, dpi=150, draw=draw_complete_bipartite, title=title)
+    if cache.fetch(key, dest): ...          # hit, dest now holds the PNG
+    else: draw; plt.savefig(dest); cache.store(key, dest)
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import shutil
+from pathlib import Path
+
+MANIFEST_NAME = 'manifest.json'
+
+
+def _graph_signature(G):
+    nodes = sorted(repr(v) for v in G.nodes())
+    edges = sorted(repr(tuple(sorted((repr(a), repr(b))))) for a, b in G.edges())
+    return {'nodes': nodes, 'edges': edges, 'multi': G.is_multigraph()}
+
+
+def figure_key(*graphs, seed=None, dpi=None, draw=None, **style):
+    """Hex key for a figure of the given graphs with the given layout seed, dpi, drawing function and style"""
+    payload = {
+        'graphs': [_graph_signature(G) for G in graphs],
+        'seed': seed,
+        'dpi': dpi,
+        'draw': inspect.getsource(draw) if draw is not None else None,
+        'style': {k: repr(v) for k, v in sorted(style.items())},
+    }
+    data = json.dumps(payload, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+class FigureCache:
+    """Directory of rendered figures named by key, plus a manifest of the last build"""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, key):
+        return self.cache_dir / f'{key}.png'
+
+    def __contains__(self, key):
+        return self.path_for(key).exists()
+
+    def fetch(self, key, dest):
+        """Copy the cached figure for key to dest; False on a miss"""
+        src = self.path_for(key)
+        if not src.exists():
+            return False
+        shutil.copyfile(src, dest)
+        return True
+
+    def store(self, key, src):
+        """Add a freshly rendered figure (atomic, so parallel workers can share the cache)"""
+        final = self.path_for(key)
+        tmp = final.with_name(f'{key}.{os.getpid()}.tmp')
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, final)
+
+    def load_manifest(self):
+        path = self.cache_dir / MANIFEST_NAME
+        if not path.exists():
+            return {}
+        with open(path, encoding='utf-8') as f:
+            return json.load(f).get('figures', {})
+
+    def write_manifest(self, figures):
+        """Record {figure name: key} for this build and evict every cached PNG not in it"""
+        keys = set(figures.values())
+        with open(self.cache_dir / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+            json.dump({'figures': figures}, f, indent=2, sort_keys=True)
+        evicted = 0
+        for path in self.cache_dir.iterdir():
+            if path.suffix in ('.png', '.tmp') and path.stem.split('.')[0] not in keys:
+                path.unlink()
+                evicted += 1
+        return evicted
@@ -7,50 +7,99 @@ This script contains all solutions and code. When run, it:
 3. Creates a formatted PDF with text, code, outputs, and images
 
 Usage:
-    python generate_assignment_pdf.py
+    python generate_assignment_pdf.py [--incremental] [--workers N] [--trace [PATH]] [--compute-only]
+
+With --incremental only the questions whose code changed are re-executed,
+and the PDF is only rebuilt when the HTML changed (see incremental_build.py).
+With --trace every question, figure, layout, the markdown conversion and
+the PDF step are timed; a summary table is printed and a Chrome trace
+written to PATH (default build_trace.json, see build_trace.py).
+With --compute-only the questions are run and the markdown written without
+drawing figures (cached ones are reused) and without importing matplotlib.
+
+The HTML and PDF embed optimized copies of the figures (resized to the page
+width at --image-dpi, palette PNGs, deduplicated; see image_assets.py).
+
+Heavy libraries are imported when a stage first needs them, and missing
+optional backends (markdown, weasyprint) are reported, never pip-installed.
 """
 
-import networkx as nx
-import matplotlib.pyplot as plt
-import numpy as np
+import argparse
 from math import floor, ceil
-import subprocess
 import sys
 import os
 from pathlib import Path
 import base64
 import io
 
-# Set up matplotlib to save figures instead of showing
-plt.ioff()  # Turn off interactive mode
-plt.rcParams['figure.figsize'] = (10, 6)
+import build_trace
+from figure_cache import FigureCache, figure_key
+from incremental_build import BuildState, write_if_changed
+from lazy_import import available, lazy_import, version
+from render_pipeline import next_figure_path, render_questions
+
+def _setup_pyplot(plt):
+    # Set up matplotlib to save figures instead of showing
+    plt.ioff()  # Turn off interactive mode
+    plt.rcParams['figure.figsize'] = (10, 6)
+
+# Heavy modules are imported on first use (see lazy_import.py); a --compute-only
+# build never draws, so it never imports matplotlib
+nx = lazy_import('networkx')
+plt = lazy_import('matplotlib.pyplot', on_load=_setup_pyplot)
+bigraphical = lazy_import('bigraphical')
+bipartite_realizer = lazy_import('bipartite_realizer')
+complement_view = lazy_import('complement_view')
+degree_sequences = lazy_import('degree_sequences')
+graph_products = lazy_import('graph_products')
+triangles = lazy_import('triangles')
+image_assets = lazy_import('image_assets')
 
 # Create directory for images
 IMAGE_DIR = Path('assignment_images')
 IMAGE_DIR.mkdir(exist_ok=True)
-image_counter = 0
-
-def save_figure(title=""):
-    """Save current figure and return image path"""
-    global image_counter
-    image_counter += 1
-    img_path = IMAGE_DIR / f'fig_{image_counter}.png'
-    plt.savefig(img_path, dpi=150, bbox_inches='tight')
-    plt.close()
+FIG_DPI = 150
+# Rendered figures by content key (see figure_cache.py)
+FIGURE_CACHE = FigureCache(IMAGE_DIR / '.cache')
+# Layouts show up as their own spans when tracing
+build_trace.instrument(nx, 'spring_layout', 'bipartite_layout')
+
+def save_figure(title="", key=None):
+    """Save current figure and return image path (renumbered to fig_N.png by render_questions)"""
+    with build_trace.span('save_figure') as span:
+        img_path = next_figure_path(key)
+        plt.savefig(img_path, dpi=FIG_DPI, bbox_inches='tight')
+        plt.close()
+        if key is not None:
+            FIGURE_CACHE.store(key, img_path)
+        if span is not None:
+            span.add(figures=1, figure_bytes=img_path.stat().st_size)
     return img_path
 
-def install_if_needed(package, import_name=None):
-    """Install package if needed"""
-    if import_name is None:
-        import_name = package.replace('-', '_')
-    try:
-        __import__(import_name)
-        return True
-    except ImportError:
-        print(f"Installing {package}...")
-        subprocess.check_call([sys.executable, '-m', 'pip', 'install', package], 
-                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        return True
+def cached_figure(key):
+    """
+    Reuse the cached figure for key and return its path, or None if it has to
+    be drawn. In compute-only mode an uncached figure is skipped instead: its
+    path is reserved (so numbering matches a full build) but nothing is drawn.
+    """
+    if key not in FIGURE_CACHE:
+        return next_figure_path(key) if COMPUTE_ONLY else None
+    with build_trace.span('cached_figure') as span:
+        img_path = next_figure_path(key)
+        FIGURE_CACHE.fetch(key, img_path)
+        if span is not None:
+            span.add(cached_figures=1, figure_bytes=img_path.stat().st_size)
+    return img_path
+
+# Per-question results of the last build (incremental mode)
+BUILD_DIR = Path('.build')
+def question_deps():
+    """Code and settings every question depends on besides its own source"""
+    return (bigraphical, bipartite_realizer, complement_view, degree_sequences, graph_products,
+            triangles, save_figure, cached_figure, FIG_DPI, version('networkx'), version('matplotlib'))
+
+# Set by generate_pdf(compute_only=True): figures that are not cached are not drawn
+COMPUTE_ONLY = False
 
 # ============================================================================
 # QUESTION 1: Triangle-Free Graphs
@@ -68,6 +117,10 @@ def q1_solution():
     
     def draw_complete_bipartite(n1, n2, title=""):
         G = nx.complete_bipartite_graph(n1, n2)
+        key = figure_key(G, dpi=FIG_DPI, draw=draw_complete_bipartite, title=title)
+        img_path = cached_figure(key)
+        if img_path is not None:
+            return img_path
         pos = nx.bipartite_layout(G, list(range(n1)))
         plt.figure(figsize=(8, 6))
         nx.draw_networkx_nodes(G, pos, nodelist=list(range(n1)), node_color='lightcoral', node_size=500)
@@ -77,12 +130,14 @@ def q1_solution():
         plt.title(title if title else f"$K_{{{n1},{n2}}}$: {n1*n2} edges")
         plt.axis('off')
         plt.tight_layout()
-        return save_figure()
+        return save_figure(key=key)
     
     for n in [2, 3, 4, 5, 6]:
         n1 = floor(n/2)
         n2 = ceil(n/2)
         max_edges = floor(n**2/4)
+        # K_{floor(n/2), ceil(n/2)} must be triangle-free with exactly max_edges edges
+        assert triangles.mantel_check(nx.complete_bipartite_graph(n1, n2))['extremal']
         img_path = draw_complete_bipartite(n1, n2, f"n={n}: $K_{{{n1},{n2}}}$ with {max_edges} edges")
         markdown.append(f"![n={n}]({img_path})\n\n")
     
@@ -102,58 +157,6 @@ def q2_solution():
     markdown = []
     markdown.append("## Question 2: Bi-graphical Sequences\n\n")
     
-    def is_bigraphical(S1, S2, verbose=False):
-        S1 = sorted(S1, reverse=True)
-        S2 = sorted(S2, reverse=True)
-        r, s = len(S1), len(S2)
-        
-        if sum(S1) != sum(S2):
-            if verbose:
-                print(f"  Sum mismatch: sum(S1)={sum(S1)}, sum(S2)={sum(S2)}")
-            return False
-        if any(d < 0 for d in S1 + S2):
-            if verbose:
-                print("  Negative degree")
-            return False
-        
-        if r == 0 and s == 0:
-            return True
-        if r == 0 or s == 0:
-            if verbose:
-                print("  One side empty, other non-empty")
-            return False
-        
-        a1, b1 = S1[0], S2[0]
-        if r == 1:
-            return sum(S2) == a1 and sorted(S2, reverse=True) == [1] * a1 + [0] * (s - a1)
-        if s == 1:
-            return sum(S1) == b1 and sorted(S1, reverse=True) == [1] * b1 + [0] * (r - b1)
-        
-        if a1 > s:
-            if verbose:
-                print(f"  a1={a1} > s={s}")
-            return False
-        if b1 > r:
-            if verbose:
-                print(f"  b1={b1} > r={r}")
-            return False
-        if a1 == 0:
-            return is_bigraphical(S1[1:], S2, verbose)
-        if b1 == 0:
-            return is_bigraphical(S1, S2[1:], verbose)
-        
-        S1_new = S1[1:]
-        S2_new = [S2[i] - 1 if i < a1 else S2[i] for i in range(s)]
-        S2_new = sorted(S2_new, reverse=True)
-        if any(d < 0 for d in S2_new):
-            if verbose:
-                print("  Reduction gives negative degree")
-            return False
-        
-        if verbose:
-            print(f"  Reduce: S1'={S1_new}, S2'={S2_new}")
-        return is_bigraphical(S1_new, S2_new, verbose)
-    
     markdown.append("### (a) $S_1 = \\langle 6, 5, 5, 5, 3, 2, 1, 1 \\rangle$, $S_2 = \\langle 5, 5, 4, 3, 2 \\rangle$\n\n")
     markdown.append("Here $a_1 = 6$ but $|S_2| = 5$, so we need $a_1 \\le s$ and it fails. ")
     markdown.append("So **I get: not bi-graphical.**\n\n")
@@ -162,13 +165,13 @@ def q2_solution():
     S1_a = [6, 5, 5, 5, 3, 2, 1, 1]
     S2_a = [5, 5, 4, 3, 2]
     output = io.StringIO()
-    sys.stdout = output
+    previous, sys.stdout = sys.stdout, output
     print("Part (a):")
     print(f"  sum(S1) = {sum(S1_a)}, sum(S2) = {sum(S2_a)}")
-    ans_a = is_bigraphical(S1_a, S2_a, verbose=True)
+    ans_a = bigraphical.is_bigraphical(S1_a, S2_a, verbose=True)
     print(f"  Bi-graphical? {ans_a}")
     print("  So my answer for (a) is: No, not bi-graphical.")
-    sys.stdout = sys.__stdout__
+    sys.stdout = previous
     markdown.append(output.getvalue())
     markdown.append("```\n\n")
     
@@ -178,19 +181,23 @@ def q2_solution():
     
     markdown.append("```python\n")
     output = io.StringIO()
-    sys.stdout = output
+    previous, sys.stdout = sys.stdout, output
     S1_b = [8, 6, 4, 4, 4, 4, 4]
     S2_b = [6, 5, 4, 4, 4, 4, 3, 3, 1]
     print("Part (b):")
     print(f"  sum(S1) = {sum(S1_b)}, sum(S2) = {sum(S2_b)}")
-    ans_b = is_bigraphical(S1_b, S2_b, verbose=True)
+    ans_b = bigraphical.is_bigraphical(S1_b, S2_b, verbose=True)
     print(f"  Bi-graphical? {ans_b}")
-    sys.stdout = sys.__stdout__
+    sys.stdout = previous
     markdown.append(output.getvalue())
     markdown.append("```\n\n")
     
-    if ans_b:
-        G = nx.bipartite.configuration_model(S1_b, S2_b)
+    def draw_realization(S1_b, S2_b):
+        G = bipartite_realizer.realize_bipartite_graph(S1_b, S2_b)
+        key = figure_key(G, dpi=FIG_DPI, draw=draw_realization, S1=S1_b, S2=S2_b)
+        img_path = cached_figure(key)
+        if img_path is not None:
+            return img_path
         n1, n2 = len(S1_b), len(S2_b)
         S1_nodes = list(range(n1))
         S2_nodes = list(range(n1, n1 + n2))
@@ -210,7 +217,10 @@ def q2_solution():
         plt.axis('off')
         plt.title("(b) A bipartite graph with the given degree sequences")
         plt.tight_layout()
-        img_path = save_figure()
+        return save_figure(key=key)
+    
+    if ans_b:
+        img_path = draw_realization(S1_b, S2_b)
         markdown.append(f"![Bipartite graph]({img_path})\n\n")
     
     return ''.join(markdown)
@@ -228,26 +238,33 @@ def q3_solution():
     markdown.append("at least 4 vertices (since each vertex has degree $\\geq 3$), so $4+4=8 > 7$ and it's impossible. ")
     markdown.append("So **I couldn't get a disconnected example**—they all end up connected. Below are two connected examples.\n\n")
     
+    def draw_connected_pair(G1, G2):
+        key = figure_key(G1, G2, seed=(42, 43), dpi=FIG_DPI, draw=draw_connected_pair)
+        img_path = cached_figure(key)
+        if img_path is not None:
+            return img_path
+        fig, axes = plt.subplots(1, 2, figsize=(14, 6))
+        pos1 = nx.spring_layout(G1, seed=42)
+        nx.draw_networkx_nodes(G1, pos1, ax=axes[0], node_color='lightblue', node_size=500)
+        nx.draw_networkx_edges(G1, pos1, ax=axes[0], alpha=0.6)
+        nx.draw_networkx_labels(G1, pos1, ax=axes[0])
+        axes[0].set_title(f"Graph 1: Connected, min degree = {min(dict(G1.degree()).values())}")
+        axes[0].axis('off')
+        pos2 = nx.spring_layout(G2, seed=43)
+        nx.draw_networkx_nodes(G2, pos2, ax=axes[1], node_color='lightcoral', node_size=500)
+        nx.draw_networkx_edges(G2, pos2, ax=axes[1], alpha=0.6)
+        nx.draw_networkx_labels(G2, pos2, ax=axes[1])
+        axes[1].set_title(f"Graph 2: Connected, min degree = {min(dict(G2.degree()).values())}")
+        axes[1].axis('off')
+        plt.tight_layout()
+        return save_figure(key=key)
+    
     G1 = nx.complete_graph(7)
     G1.remove_edges_from([(0,1), (2,3), (4,5)])
     G2 = nx.complete_graph(7)
     G2.remove_edges_from([(0,2), (1,3), (4,6)])
     
-    fig, axes = plt.subplots(1, 2, figsize=(14, 6))
-    pos1 = nx.spring_layout(G1, seed=42)
-    nx.draw_networkx_nodes(G1, pos1, ax=axes[0], node_color='lightblue', node_size=500)
-    nx.draw_networkx_edges(G1, pos1, ax=axes[0], alpha=0.6)
-    nx.draw_networkx_labels(G1, pos1, ax=axes[0])
-    axes[0].set_title(f"Graph 1: Connected, min degree = {min(dict(G1.degree()).values())}")
-    axes[0].axis('off')
-    pos2 = nx.spring_layout(G2, seed=43)
-    nx.draw_networkx_nodes(G2, pos2, ax=axes[1], node_color='lightcoral', node_size=500)
-    nx.draw_networkx_edges(G2, pos2, ax=axes[1], alpha=0.6)
-    nx.draw_networkx_labels(G2, pos2, ax=axes[1])
-    axes[1].set_title(f"Graph 2: Connected, min degree = {min(dict(G2.degree()).values())}")
-    axes[1].axis('off')
-    plt.tight_layout()
-    img_path = save_figure()
+    img_path = draw_connected_pair(G1, G2)
     markdown.append(f"![Graphs on 7 vertices]({img_path})\n\n")
     
     markdown.append("### (b) Graphs on 8 vertices with $\\deg(v) \\geq 4$\n\n")
@@ -258,21 +275,7 @@ def q3_solution():
     G1.remove_edges_from([(0,1), (2,3), (4,5)])
     G2 = nx.complete_graph(8)
     G2.remove_edges_from([(0,2), (1,3), (4,6), (5,7)])
-    fig, axes = plt.subplots(1, 2, figsize=(14, 6))
-    pos1 = nx.spring_layout(G1, seed=42)
-    nx.draw_networkx_nodes(G1, pos1, ax=axes[0], node_color='lightblue', node_size=500)
-    nx.draw_networkx_edges(G1, pos1, ax=axes[0], alpha=0.6)
-    nx.draw_networkx_labels(G1, pos1, ax=axes[0])
-    axes[0].set_title(f"Graph 1: Connected, min degree = {min(dict(G1.degree()).values())}")
-    axes[0].axis('off')
-    pos2 = nx.spring_layout(G2, seed=43)
-    nx.draw_networkx_nodes(G2, pos2, ax=axes[1], node_color='lightcoral', node_size=500)
-    nx.draw_networkx_edges(G2, pos2, ax=axes[1], alpha=0.6)
-    nx.draw_networkx_labels(G2, pos2, ax=axes[1])
-    axes[1].set_title(f"Graph 2: Connected, min degree = {min(dict(G2.degree()).values())}")
-    axes[1].axis('off')
-    plt.tight_layout()
-    img_path = save_figure()
+    img_path = draw_connected_pair(G1, G2)
     markdown.append(f"![Graphs on 8 vertices]({img_path})\n\n")
     
     markdown.append("### (c) Proof\n\n")
@@ -296,27 +299,34 @@ def q4_solution():
     markdown.append("$\\langle 3, 3, 2, 1, 1, 1, 1 \\rangle$, and both are trees. ")
     markdown.append("So **I think they are isomorphic** (and the code confirms it).\n\n")
     
+    def draw_trees(G1, G2):
+        key = figure_key(G1, G2, seed=(42, 43), dpi=FIG_DPI, draw=draw_trees)
+        img_path = cached_figure(key)
+        if img_path is not None:
+            return img_path
+        fig, axes = plt.subplots(1, 2, figsize=(14, 6))
+        pos1 = nx.spring_layout(G1, seed=42)
+        nx.draw_networkx_nodes(G1, pos1, ax=axes[0], node_color='lightblue', node_size=500)
+        nx.draw_networkx_edges(G1, pos1, ax=axes[0], alpha=0.6)
+        nx.draw_networkx_labels(G1, pos1, ax=axes[0])
+        deg_seq1 = degree_sequences.degree_sequence(G1)
+        axes[0].set_title(f"Tree 1: Degree sequence {deg_seq1}")
+        axes[0].axis('off')
+        pos2 = nx.spring_layout(G2, seed=43)
+        nx.draw_networkx_nodes(G2, pos2, ax=axes[1], node_color='lightcoral', node_size=500)
+        nx.draw_networkx_edges(G2, pos2, ax=axes[1], alpha=0.6)
+        nx.draw_networkx_labels(G2, pos2, ax=axes[1])
+        deg_seq2 = degree_sequences.degree_sequence(G2)
+        axes[1].set_title(f"Tree 2: Degree sequence {deg_seq2}")
+        axes[1].axis('off')
+        plt.tight_layout()
+        return save_figure(key=key)
+    
     G1 = nx.Graph()
     G1.add_edges_from([(0,1), (1,2), (1,3), (1,4), (2,5), (2,6)])
     G2 = nx.Graph()
     G2.add_edges_from([(0,1), (0,2), (0,3), (1,4), (2,5), (3,6)])
-    fig, axes = plt.subplots(1, 2, figsize=(14, 6))
-    pos1 = nx.spring_layout(G1, seed=42)
-    nx.draw_networkx_nodes(G1, pos1, ax=axes[0], node_color='lightblue', node_size=500)
-    nx.draw_networkx_edges(G1, pos1, ax=axes[0], alpha=0.6)
-    nx.draw_networkx_labels(G1, pos1, ax=axes[0])
-    deg_seq1 = sorted([d for v, d in G1.degree()], reverse=True)
-    axes[0].set_title(f"Tree 1: Degree sequence {deg_seq1}")
-    axes[0].axis('off')
-    pos2 = nx.spring_layout(G2, seed=43)
-    nx.draw_networkx_nodes(G2, pos2, ax=axes[1], node_color='lightcoral', node_size=500)
-    nx.draw_networkx_edges(G2, pos2, ax=axes[1], alpha=0.6)
-    nx.draw_networkx_labels(G2, pos2, ax=axes[1])
-    deg_seq2 = sorted([d for v, d in G2.degree()], reverse=True)
-    axes[1].set_title(f"Tree 2: Degree sequence {deg_seq2}")
-    axes[1].axis('off')
-    plt.tight_layout()
-    img_path = save_figure()
+    img_path = draw_trees(G1, G2)
     img_src = str(img_path).replace('\\', '/')
     markdown.append(f'<figure class="figure-with-caption"><img src="{img_src}" alt="Figure 2" /><figcaption>Figure 2</figcaption></figure>\n\n')
     
@@ -339,6 +349,11 @@ def q5_solution():
     
     def draw_path_and_complement(n):
         P = nx.path_graph(n)
+        connected = complement_view.complement_is_connected(P)
+        key = figure_key(P, seed=(42, 43), dpi=FIG_DPI, draw=draw_path_and_complement)
+        img_path = cached_figure(key)
+        if img_path is not None:
+            return img_path, connected
         P_complement = nx.complement(P)
         fig, axes = plt.subplots(1, 2, figsize=(12, 5))
         pos_P = nx.spring_layout(P, seed=42)
@@ -351,11 +366,10 @@ def q5_solution():
         nx.draw_networkx_nodes(P_complement, pos_comp, ax=axes[1], node_color='lightcoral', node_size=500)
         nx.draw_networkx_edges(P_complement, pos_comp, ax=axes[1], alpha=0.6)
         nx.draw_networkx_labels(P_complement, pos_comp, ax=axes[1])
-        connected = nx.is_connected(P_complement)
         axes[1].set_title(f"$\\overline{{P_{n}}}$ (Connected: {connected})")
         axes[1].axis('off')
         plt.tight_layout()
-        return save_figure(), connected
+        return save_figure(key=key), connected
     
     results = {}
     for n in range(2, 7):
@@ -393,21 +407,12 @@ def q6_solution():
     markdown.append("### (a) Draw $P_2 * K_3$ and $P_3 * K_3$\n\n")
     markdown.append("I implemented the product and drew these two graphs below.\n\n")
     
-    def cartesian_product(G, H):
-        K = nx.Graph()
-        for u in G.nodes():
-            for a in H.nodes():
-                K.add_node((u, a))
-        for u in G.nodes():
-            for a, b in H.edges():
-                K.add_edge((u, a), (u, b))
-        for u, v in G.edges():
-            for a in H.nodes():
-                K.add_edge((u, a), (v, a))
-        return K
-    
     def draw_product(G, H, G_name="G", H_name="H"):
-        K = cartesian_product(G, H)
+        K = graph_products.cartesian_product(G, H)
+        key = figure_key(G, H, seed=42, dpi=FIG_DPI, draw=draw_product, G_name=G_name, H_name=H_name)
+        img_path = cached_figure(key)
+        if img_path is not None:
+            return K, img_path
         pos = nx.spring_layout(K, seed=42)
         plt.figure(figsize=(8, 6))
         nx.draw_networkx_nodes(K, pos, node_color="lightgreen", node_size=400)
@@ -417,7 +422,7 @@ def q6_solution():
         plt.title(f"Cartesian product {G_name} * {H_name}: |V|={K.number_of_nodes()}, |E|={K.number_of_edges()}")
         plt.axis("off")
         plt.tight_layout()
-        img_path = save_figure()
+        img_path = save_figure(key=key)
         return K, img_path
     
     P2 = nx.path_graph(2)
@@ -434,16 +439,17 @@ def q6_solution():
     markdown.append("I tried several pairs $(G,H)$ and checked that the number of edges in $G * H$ always matches $n_1 m_2 + n_2 m_1$.\n\n")
     markdown.append("```python\n")
     output = io.StringIO()
-    sys.stdout = output
+    previous, sys.stdout = sys.stdout, output
     
     def edge_count_product(G, H):
         n1, m1 = G.number_of_nodes(), G.number_of_edges()
         n2, m2 = H.number_of_nodes(), H.number_of_edges()
-        K = cartesian_product(G, H)
-        m = K.number_of_edges()
+        # count edges on the sparse product adjacency, no NetworkX graph needed
+        K = graph_products.product_adjacency(graph_products.adjacency_matrix(G), graph_products.adjacency_matrix(H))
+        m = K.nnz // 2
         formula = n1 * m2 + n2 * m1
         print(f"G: n1={n1}, m1={m1}; H: n2={n2}, m2={m2}")
-        print(f"G * H: |V|={K.number_of_nodes()}, |E|={m}")
+        print(f"G * H: |V|={K.shape[0]}, |E|={m}")
         print(f"Formula n1*m2 + n2*m1 = {formula}")
         print(f"Matches formula? {m == formula}\n")
     
@@ -455,7 +461,7 @@ def q6_solution():
             print(f"Example G{i} * H{j}:")
             edge_count_product(G, H)
     
-    sys.stdout = sys.__stdout__
+    sys.stdout = previous
     markdown.append(output.getvalue())
     markdown.append("```\n\n")
     
@@ -473,32 +479,39 @@ def q7_solution():
     markdown.append("I tried $K_{2,2}$: it's bipartite, and its complement is just two disjoint edges, ")
     markdown.append("so the complement is bipartite too. I drew both below.\n\n")
     
+    def draw_with_complement(G):
+        key = figure_key(G, seed=42, dpi=FIG_DPI, draw=draw_with_complement)
+        img_path = cached_figure(key)
+        if img_path is not None:
+            return img_path
+        G_complement = nx.complement(G)
+        fig, axes = plt.subplots(1, 2, figsize=(12, 5))
+        pos = nx.bipartite_layout(G, [0, 1])
+        nx.draw_networkx_nodes(G, pos, nodelist=[0, 1], node_color='lightcoral', ax=axes[0], node_size=500)
+        nx.draw_networkx_nodes(G, pos, nodelist=[2, 3], node_color='lightblue', ax=axes[0], node_size=500)
+        nx.draw_networkx_edges(G, pos, ax=axes[0], alpha=0.6, width=2)
+        nx.draw_networkx_labels(G, pos, ax=axes[0])
+        axes[0].set_title("$K_{2,2}$ (Bipartite)")
+        axes[0].axis('off')
+        pos_comp = nx.spring_layout(G_complement, seed=42)
+        nx.draw_networkx_nodes(G_complement, pos_comp, ax=axes[1], node_color='lightgreen', node_size=500)
+        nx.draw_networkx_edges(G_complement, pos_comp, ax=axes[1], alpha=0.6, width=2)
+        nx.draw_networkx_labels(G_complement, pos_comp, ax=axes[1])
+        is_bipartite_comp = complement_view.complement_is_bipartite(G)
+        axes[1].set_title(f"$\\overline{{K_{2,2}}}$ (Bipartite: {is_bipartite_comp})")
+        axes[1].axis('off')
+        plt.tight_layout()
+        return save_figure(key=key)
+    
     G = nx.complete_bipartite_graph(2, 2)
-    G_complement = nx.complement(G)
-    fig, axes = plt.subplots(1, 2, figsize=(12, 5))
-    pos = nx.bipartite_layout(G, [0, 1])
-    nx.draw_networkx_nodes(G, pos, nodelist=[0, 1], node_color='lightcoral', ax=axes[0], node_size=500)
-    nx.draw_networkx_nodes(G, pos, nodelist=[2, 3], node_color='lightblue', ax=axes[0], node_size=500)
-    nx.draw_networkx_edges(G, pos, ax=axes[0], alpha=0.6, width=2)
-    nx.draw_networkx_labels(G, pos, ax=axes[0])
-    axes[0].set_title("$K_{2,2}$ (Bipartite)")
-    axes[0].axis('off')
-    pos_comp = nx.spring_layout(G_complement, seed=42)
-    nx.draw_networkx_nodes(G_complement, pos_comp, ax=axes[1], node_color='lightgreen', node_size=500)
-    nx.draw_networkx_edges(G_complement, pos_comp, ax=axes[1], alpha=0.6, width=2)
-    nx.draw_networkx_labels(G_complement, pos_comp, ax=axes[1])
-    is_bipartite_comp = nx.is_bipartite(G_complement)
-    axes[1].set_title(f"$\\overline{{K_{2,2}}}$ (Bipartite: {is_bipartite_comp})")
-    axes[1].axis('off')
-    plt.tight_layout()
-    img_path = save_figure()
+    img_path = draw_with_complement(G)
     markdown.append(f"![K_{2,2} and complement]({img_path})\n\n")
     
     markdown.append("### (a') Experiment with more examples\n\n")
     markdown.append("I ran a few more bipartite graphs and checked whether their complements are bipartite.\n\n")
     markdown.append("```python\n")
     output = io.StringIO()
-    sys.stdout = output
+    previous, sys.stdout = sys.stdout, output
     
     examples = [
         ("K_{2,2}", nx.complete_bipartite_graph(2, 2)),
@@ -507,14 +520,14 @@ def q7_solution():
     ]
     
     for name, G in examples:
-        G_comp = nx.complement(G)
+        G_comp = complement_view.ComplementView(G)
         print(f"\n{name}:")
         print(f"  Original bipartite: {nx.is_bipartite(G)}")
-        print(f"  Complement bipartite: {nx.is_bipartite(G_comp)}")
+        print(f"  Complement bipartite: {complement_view.complement_is_bipartite(G)}")
         print(f"  Original: {G.number_of_nodes()} vertices, {G.number_of_edges()} edges")
         print(f"  Complement: {G_comp.number_of_nodes()} vertices, {G_comp.number_of_edges()} edges")
     
-    sys.stdout = sys.__stdout__
+    sys.stdout = previous
     markdown.append(output.getvalue())
     markdown.append("```\n\n")
     
@@ -535,9 +548,41 @@ def q7_solution():
 # MAIN: Generate PDF
 # ============================================================================
 
-def generate_pdf():
-    """Generate PDF from all solutions"""
-    print("Generating assignment PDF...")
+def generate_pdf(workers=None, incremental=False, trace=None, compute_only=False,
+                 image_dpi=FIG_DPI, inline_images=0):
+    """
+    Generate PDF from all solutions (questions are rendered in parallel, see render_pipeline.py).
+
+    With trace set to a path, the build is traced: a span summary is printed
+    and a Chrome trace written there (see build_trace.py).
+
+    compute_only runs every question's checks in this process and writes the
+    markdown only: figures are reused from the cache or skipped, and
+    matplotlib, markdown and weasyprint are never imported.
+
+    The HTML and PDF use copies of the figures resized to the page width at
+    image_dpi, palette-quantized and deduplicated, with images up to
+    inline_images bytes inlined (see image_assets.py); image_dpi=None keeps
+    the full-size figures.
+    """
+    global COMPUTE_ONLY
+    COMPUTE_ONLY = compute_only
+    try:
+        if trace is None:
+            return _build_document(workers, incremental, image_dpi, inline_images)
+        build_trace.enable()
+        try:
+            with build_trace.span('generate_pdf'):
+                return _build_document(workers, incremental, image_dpi, inline_images)
+        finally:
+            build_trace.report()
+            print(f"Trace written to: {build_trace.write_chrome_trace(trace)}")
+            build_trace.disable()
+    finally:
+        COMPUTE_ONLY = False
+
+def _build_document(workers, incremental, image_dpi, inline_images):
+    print("Generating assignment markdown (compute only)..." if COMPUTE_ONLY else "Generating assignment PDF...")
     
     # Collect all markdown content
     full_markdown = []
@@ -545,48 +590,52 @@ def generate_pdf():
     full_markdown.append("My solutions for the assignment. I used Python (NetworkX, matplotlib) for the graphs.\n\n")
     full_markdown.append("---\n\n")
     
-    print("Processing Question 1...")
-    full_markdown.append(q1_solution())
-    full_markdown.append("\n---\n\n")
-    
-    print("Processing Question 2...")
-    full_markdown.append(q2_solution())
-    full_markdown.append("\n---\n\n")
-    
-    print("Processing Question 3...")
-    full_markdown.append(q3_solution())
-    full_markdown.append("\n---\n\n")
-    
-    print("Processing Question 4...")
-    full_markdown.append(q4_solution())
-    full_markdown.append("\n---\n\n")
-    
-    print("Processing Question 5...")
-    full_markdown.append(q5_solution())
-    full_markdown.append("\n---\n\n")
-    
-    print("Processing Question 6...")
-    full_markdown.append(q6_solution())
-    full_markdown.append("\n---\n\n")
-    
-    print("Processing Question 7...")
-    full_markdown.append(q7_solution())
+    questions = [q1_solution, q2_solution, q3_solution, q4_solution,
+                 q5_solution, q6_solution, q7_solution]
+    state = BuildState(BUILD_DIR) if incremental else None
+    if COMPUTE_ONLY:
+        workers = 1                 # nothing to draw, so a process pool would only add startup time
+    with build_trace.span('render_questions'):
+        fragments = render_questions(questions, IMAGE_DIR, workers=workers, cache=FIGURE_CACHE,
+                                     state=state, deps=question_deps() if incremental else ())
+    full_markdown.append("\n---\n\n".join(fragments))
     
     markdown_content = ''.join(full_markdown)
     
     # Save markdown file
     md_path = Path('Assignment2_Solutions.md')
-    with open(md_path, 'w', encoding='utf-8') as f:
-        f.write(markdown_content)
-    print(f"\nMarkdown saved to: {md_path}")
+    if write_if_changed(md_path, markdown_content) or not incremental:
+        print(f"\nMarkdown saved to: {md_path}")
+    else:
+        print(f"\nMarkdown unchanged: {md_path}")
+    if COMPUTE_ONLY:
+        return True
     
-    # Convert markdown to HTML first
-    install_if_needed('markdown')
+    # Convert markdown to HTML first (optional backends are checked, never installed)
+    if not available('markdown'):
+        print("The 'markdown' package is not installed: skipping HTML and PDF (pip install markdown)")
+        return False
     
     import markdown
     
     # Convert markdown to HTML
-    html_content = markdown.markdown(markdown_content, extensions=['extra', 'codehilite'])
+    with build_trace.span('markdown') as span:
+        html_content = markdown.markdown(markdown_content, extensions=['extra', 'codehilite'])
+        if span is not None:
+            span.add(markdown_bytes=len(markdown_content.encode('utf-8')),
+                     html_bytes=len(html_content.encode('utf-8')))
+    
+    # Point the HTML at resized / palette / deduplicated copies of the figures
+    if image_dpi is not None and available('PIL'):
+        with build_trace.span('optimize_images') as span:
+            optimizer = image_assets.ImageOptimizer(IMAGE_DIR / 'web', dpi=image_dpi,
+                                                    inline_bytes=inline_images)
+            html_content = optimizer.rewrite_html(html_content)
+            optimizer.prune()
+            if span is not None:
+                stats = optimizer.stats()
+                span.add(image_bytes_before=stats['bytes_before'], image_bytes_after=stats['bytes_after'])
+        optimizer.report()
     
     # Add CSS
     css_style = """
@@ -685,17 +734,25 @@ def generate_pdf():
     
     # Save HTML file
     html_path = Path('Assignment2_Solutions.html')
-    with open(html_path, 'w', encoding='utf-8') as f:
-        f.write(full_html)
+    html_changed = write_if_changed(html_path, full_html)
     print(f"HTML saved to: {html_path}")
     
+    pdf_path = Path('Assignment2_Solutions.pdf')
+    if incremental and not html_changed and pdf_path.exists():
+        print(f"HTML unchanged, keeping PDF: {pdf_path}")
+        return True
+    
     # Try to generate PDF with weasyprint
     try:
-        install_if_needed('weasyprint')
-        from weasyprint import HTML
+        if not available('weasyprint'):
+            raise ImportError("weasyprint is not installed (pip install weasyprint)")
+        with build_trace.span('import_weasyprint'):
+            from weasyprint import HTML
         print("Converting to PDF...")
-        pdf_path = Path('Assignment2_Solutions.pdf')
-        HTML(string=full_html, base_url=str(Path.cwd())).write_pdf(pdf_path)
+        with build_trace.span('write_pdf') as span:
+            HTML(string=full_html, base_url=str(Path.cwd())).write_pdf(pdf_path)
+            if span is not None:
+                span.add(pdf_bytes=pdf_path.stat().st_size)
         print(f"✓ PDF generated: {pdf_path}")
         return True
     except Exception as e:
@@ -712,4 +769,22 @@ def generate_pdf():
         return False
 
 if __name__ == '__main__':
-    generate_pdf()
+    parser = argparse.ArgumentParser(description="Generate the Assignment 2 solutions document")
+    parser.add_argument('--incremental', action='store_true',
+                        help="only re-run questions whose code changed")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="render processes (default: one per CPU, 1 = no pool)")
+    parser.add_argument('--trace', nargs='?', const='build_trace.json', default=None, metavar='PATH',
+                        help="time every build step and write a Chrome trace (default build_trace.json)")
+    parser.add_argument('--compute-only', action='store_true',
+                        help="run the graph checks and write the markdown only (no drawing, HTML or PDF)")
+    parser.add_argument('--image-dpi', type=int, default=FIG_DPI,
+                        help=f"print resolution of the figures in the HTML / PDF (default {FIG_DPI})")
+    parser.add_argument('--no-optimize-images', action='store_true',
+                        help="embed the full-size figures instead of optimized copies")
+    parser.add_argument('--inline-images', type=int, default=0, metavar='BYTES',
+                        help="inline optimized images up to this size as data: URIs (default 0 = never)")
+    args = parser.parse_args()
+    generate_pdf(workers=args.workers, incremental=args.incremental, trace=args.trace,
+                 compute_only=args.compute_only, inline_images=args.inline_images,
+                 image_dpi=None if args.no_optimize_images else args.image_dpi)
@@ -0,0 +1,405 @@
+"""
+Exhaustive sweeps over small graphs and trees
+
+Checks a claim on every graph (or tree) on n vertices, up to isomorphism,
+instead of on a few hand-picked examples. Graphs are bitmask rows: rows[v]
+has bit u set when uv is an edge.
+
+- graphs: canonical augmentation (McKay). Every graph on n vertices is a
+  graph on n - 1 vertices plus one vertex joined to some subset; a child is
+  kept only if its new vertex is in the orbit of its canonical vertex (the
+  highest-degree vertex with the largest canonical label, canonical_form.py),
+  so each class has exactly one parent. The tree is walked depth first and
+  only the children of one parent are compared with each other: memory does
+  not grow with the number of graphs. A hereditary `prune` predicate (e.g.
+  triangle_free) is applied to the children, which keeps restricted classes
+  small. The subtrees below the graphs on 6 vertices go to a process pool.
+  On one core all graphs on 8 vertices take about 15 s and the 274,668 on 9
+  vertices about 4 minutes; the 12 million on 10 are hours of pure Python
+  even on a pool (use nauty's geng there), pruned classes reach further.
+- trees: the WROM generator (Wright, Richmond, Odlyzko, McKay), which walks
+  canonical level sequences of free trees in constant amortized time, so
+  there is no deduplication at all.
+
+For each n the sweep writes counterexamples to counterexamples.jsonl as soon
+as they are found and rewrites summary.json with the running counts.
+
+Usage:
+    python graph_sweep.py trees 4 16 complement_connected --where '!star'
+    python graph_sweep.py graphs 2 9 mantel --prune triangle_free
+    sweep('graphs', range(2, 9), claim=connected, where=min_degree_half)
+"""
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from canonical_form import adjacency_certificate, adjacency_labeling
+
+# ----------------------------------------------------------------------------
+# Predicates: f(n, rows) -> bool, module-level so they can go to worker processes
+# ----------------------------------------------------------------------------
+
+def _bits(b):
+    while b:
+        low = b & -b
+        yield low.bit_length() - 1
+        b ^= low
+
+
+def edge_count(n, rows):
+    return sum(r.bit_count() for r in rows) // 2
+
+
+def min_degree(n, rows):
+    return min((r.bit_count() for r in rows), default=0)
+
+
+def complement_rows(n, rows):
+    full = (1 << n) - 1
+    return [full & ~r & ~(1 << v) for v, r in enumerate(rows)]
+
+
+def _reach(n, rows):
+    seen = frontier = 1
+    while frontier:
+        nxt = 0
+        for v in _bits(frontier):
+            nxt |= rows[v]
+        frontier = nxt & ~seen
+        seen |= frontier
+    return seen
+
+
+def connected(n, rows):
+    return n > 0 and _reach(n, rows) == (1 << n) - 1
+
+
+def bipartite(n, rows):
+    side = {}
+    for s in range(n):
+        if s in side:
+            continue
+        side[s] = 0
+        stack = [s]
+        while stack:
+            v = stack.pop()
+            for u in _bits(rows[v]):
+                if u not in side:
+                    side[u] = 1 - side[v]
+                    stack.append(u)
+                elif side[u] == side[v]:
+                    return False
+    return True
+
+
+def triangle_free(n, rows):
+    return all(not (rows[v] & rows[u]) for v in range(n) for u in _bits(rows[v]) if u > v)
+
+
+def star(n, rows):
+    return n >= 2 and any(r.bit_count() == n - 1 for r in rows) and edge_count(n, rows) == n - 1
+
+
+def complement_connected(n, rows):
+    return connected(n, complement_rows(n, rows))
+
+
+def complement_bipartite(n, rows):
+    return bipartite(n, complement_rows(n, rows))
+
+
+def min_degree_half(n, rows):
+    """deg(v) >= (n - 1) / 2 for every v (Question 3(c))"""
+    return 2 * min_degree(n, rows) >= n - 1
+
+
+def mantel(n, rows):
+    """At most floor(n^2 / 4) edges (Mantel's bound for triangle-free graphs)"""
+    return edge_count(n, rows) <= n * n // 4
+
+
+PREDICATES = {f.__name__: f for f in (connected, bipartite, triangle_free, star, complement_connected,
+                                      complement_bipartite, min_degree_half, mantel)}
+
+
+class Not:
+    """Negated predicate (picklable, unlike a lambda)"""
+
+    def __init__(self, f):
+        self.f = f
+        self.__name__ = '!' + f.__name__
+
+    def __call__(self, n, rows):
+        return not self.f(n, rows)
+
+
+class All:
+    """Conjunction of predicates"""
+
+    def __init__(self, *fs):
+        self.fs = fs
+        self.__name__ = ' & '.join(f.__name__ for f in fs)
+
+    def __call__(self, n, rows):
+        return all(f(n, rows) for f in self.fs)
+
+
+def parse_predicate(spec):
+    """'connected', '!star' or 'bipartite,!star' -> predicate"""
+    parts = []
+    for name in spec.split(','):
+        name = name.strip()
+        negate = name.startswith('!')
+        f = PREDICATES[name.lstrip('!')]
+        parts.append(Not(f) if negate else f)
+    return parts[0] if len(parts) == 1 else All(*parts)
+
+# ----------------------------------------------------------------------------
+# Generators
+# ----------------------------------------------------------------------------
+
+def _adj(rows):
+    return [list(_bits(r)) for r in rows]
+
+
+def _canonical_child(n, rows):
+    """
+    Certificate of the graph rows on n vertices if its last vertex is a
+    canonical one to delete, else None. The canonical vertex is the
+    highest-degree vertex with the largest canonical label; the last vertex
+    qualifies if an automorphism maps it there.
+    """
+    deg = [r.bit_count() for r in rows]
+    top = max(deg)
+    if deg[-1] != top:
+        return None
+    adj = _adj(rows)
+    cert, lab, orbits = adjacency_labeling(adj)
+    m = max((v for v in range(n) if deg[v] == top), key=lab.__getitem__)
+    if m == n - 1 or orbits[m] == orbits[n - 1]:
+        return cert
+    # Not joined by the automorphisms found: compare the graph with each of them marked
+    same = (adjacency_certificate(adj, [v == m for v in range(n)])
+            == adjacency_certificate(adj, [v == n - 1 for v in range(n)]))
+    return cert if same else None
+
+
+def _augment(n, rows, prune):
+    """
+    Children of the graph rows on n vertices: one per isomorphism class of
+    graphs on n + 1 vertices whose canonical deletion gives back rows.
+    """
+    seen = set()
+    for S in range(1 << n):
+        child = [r | (1 << n) if S >> v & 1 else r for v, r in enumerate(rows)] + [S]
+        if prune is not None and not prune(n + 1, child):
+            continue
+        cert = _canonical_child(n + 1, child)
+        # Two subsets in one orbit of the parent's automorphisms give the same child
+        if cert is not None and cert not in seen:
+            seen.add(cert)
+            yield tuple(child)
+
+
+def _descendants(n, rows, target, prune):
+    """Graphs on target vertices below rows in the canonical augmentation tree, depth first"""
+    if n == target:
+        yield rows
+        return
+    for child in _augment(n, rows, prune):
+        yield from _descendants(n + 1, child, target, prune)
+
+
+def _subtrees(job):
+    roots, n, target, prune = job
+    return [rows for root in roots for rows in _descendants(n, root, target, prune)]
+
+
+def iter_graphs(n, prune=None, workers=None, split=6, batch=4):
+    """
+    Every graph on n vertices once per isomorphism class, as a rows tuple.
+
+    The graphs on `split` vertices are generated here; their subtrees are
+    handed out to a process pool in batches of `batch` roots.
+    """
+    if n < 1:
+        return
+    workers = workers or os.cpu_count() or 1
+    split = min(split, n)
+    roots = list(_descendants(1, (0,), split, prune))
+    if split == n or workers == 1:
+        for root in roots:
+            yield from _descendants(split, root, n, prune)
+        return
+    jobs = [(roots[i:i + batch], split, n, prune) for i in range(0, len(roots), batch)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for part in pool.map(_subtrees, jobs):
+            yield from part
+
+
+def _next_rooted_tree(seq, p=None):
+    if p is None:
+        p = len(seq) - 1
+        while seq[p] == 1:
+            p -= 1
+    if p == 0:
+        return None
+    q = p - 1
+    while seq[q] != seq[p] - 1:
+        q -= 1
+    out = list(seq)
+    for i in range(p, len(out)):
+        out[i] = out[i - p + q]
+    return out
+
+
+def _split_tree(seq):
+    """Level sequence -> (first subtree of the root, rest of the tree)"""
+    m = len(seq)
+    ones = [i for i, x in enumerate(seq) if x == 1]
+    if len(ones) > 1:
+        m = ones[1]
+    return [x - 1 for x in seq[1:m]], [0] + seq[m:]
+
+
+def _next_tree(seq):
+    left, rest = _split_tree(seq)
+    lh, rh = max(left), max(rest)
+    valid = rh > lh or (rh == lh and (len(left) < len(rest) or (len(left) == len(rest) and left <= rest)))
+    if valid:
+        return seq
+    p = len(left)
+    nxt = _next_rooted_tree(seq, p)
+    if seq[p] > 2:
+        new_left, _ = _split_tree(nxt)
+        suffix = list(range(1, max(new_left) + 2))
+        nxt[-len(suffix):] = suffix
+    return nxt
+
+
+def _tree_rows(seq):
+    rows = [0] * len(seq)
+    stack = []
+    for i, level in enumerate(seq):
+        while stack and seq[stack[-1]] >= level:
+            stack.pop()
+        if stack:
+            j = stack[-1]
+            rows[i] |= 1 << j
+            rows[j] |= 1 << i
+        stack.append(i)
+    return tuple(rows)
+
+
+def iter_trees(n):
+    """Every free tree on n vertices once, as a rows tuple (WROM)"""
+    if n == 1:
+        yield (0,)
+        return
+    if n < 1:
+        return
+    seq = list(range(n // 2 + 1)) + list(range(1, (n + 1) // 2))
+    while seq is not None:
+        seq = _next_tree(seq)
+        if seq is None:
+            return
+        yield _tree_rows(seq)
+        seq = _next_rooted_tree(seq)
+
+# ----------------------------------------------------------------------------
+# Sweep
+# ----------------------------------------------------------------------------
+
+def _evaluate(job):
+    n, graphs, claim, where = job
+    tested, failures = 0, []
+    for rows in graphs:
+        if where is not None and not where(n, rows):
+            continue
+        tested += 1
+        if not claim(n, rows):
+            failures.append(rows)
+    return tested, failures
+
+
+def _edges(rows):
+    return [[u, v] for u, r in enumerate(rows) for v in _bits(r) if u < v]
+
+
+def sweep(kind, sizes, claim, where=None, prune=None, out_dir='sweeps', workers=None, batch=2048,
+          max_counterexamples=1000):
+    """
+    Check claim(n, rows) on every graph/tree with where(n, rows) for n in sizes.
+
+    kind is 'graphs' or 'trees'. Counterexamples (at most max_counterexamples
+    per n) are appended to out_dir/counterexamples.jsonl as they are found;
+    out_dir/summary.json holds the counts so far. Returns the summary dict.
+    """
+    sizes = sorted(sizes)
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    summary = {'kind': kind, 'claim': claim.__name__, 'where': where.__name__ if where else None,
+               'prune': prune.__name__ if prune else None, 'levels': {}}
+    workers = workers or os.cpu_count() or 1
+
+    if kind == 'graphs':
+        levels = ((n, iter_graphs(n, prune, workers)) for n in sizes)
+    elif kind == 'trees':
+        levels = ((n, iter_trees(n)) for n in sizes)
+    else:
+        raise ValueError(f"unknown kind {kind!r}, expected 'graphs' or 'trees'")
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        with open(out / 'counterexamples.jsonl', 'w') as cx:
+            for n, graphs in levels:
+                counts = {'graphs': 0, 'tested': 0, 'counterexamples': 0}
+                jobs = _batches(n, graphs, claim, where, batch, counts)
+                results = pool.map(_evaluate, jobs) if pool else map(_evaluate, jobs)
+                for tested, failures in results:
+                    counts['tested'] += tested
+                    for rows in failures:
+                        if counts['counterexamples'] < max_counterexamples:
+                            cx.write(json.dumps({'n': n, 'edges': _edges(rows)}) + '\n')
+                        counts['counterexamples'] += 1
+                    cx.flush()
+                summary['levels'][n] = counts
+                (out / 'summary.json').write_text(json.dumps(summary, indent=2))
+                print(f"n = {n}: {counts['graphs']} {kind}, {counts['tested']} tested, "
+                      f"{counts['counterexamples']} counterexamples")
+    finally:
+        if pool:
+            pool.shutdown()
+    return summary
+
+
+def _batches(n, graphs, claim, where, size, counts):
+    chunk = []
+    for rows in graphs:
+        chunk.append(rows)
+        counts['graphs'] += 1
+        if len(chunk) == size:
+            yield n, chunk, claim, where
+            chunk = []
+    if chunk:
+        yield n, chunk, claim, where
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Check a claim on every small graph or tree")
+    parser.add_argument('kind', choices=('graphs', 'trees'))
+    parser.add_argument('min_n', type=int)
+    parser.add_argument('max_n', type=int, help="all graphs: 9 is minutes, 10 is hours (trees go much further)")
+    parser.add_argument('claim', help=f"comma-separated predicates, '!' negates: {', '.join(PREDICATES)}")
+    parser.add_argument('--where', help="only test graphs satisfying these predicates")
+    parser.add_argument('--prune', help="hereditary predicate restricting generation (graphs only)")
+    parser.add_argument('--out', default='sweeps')
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+    sweep(args.kind, range(args.min_n, args.max_n + 1), parse_predicate(args.claim),
+          where=parse_predicate(args.where) if args.where else None,
+          prune=parse_predicate(args.prune) if args.prune else None,
+          out_dir=args.out, workers=args.workers)
@@ -0,0 +1,203 @@
+"""
+Image optimization stage between the figures and the HTML / PDF
+
+The figures are saved at FIG_DPI with bbox_inches='tight', so they are up
+to 2000+ pixels wide while the printed page only has PRINT_WIDTH_IN inches
+for them (A4 minus the 2 cm margins in the stylesheet; the screen layout
+is narrower still). Every <img> in the HTML that points at a local PNG is
+replaced by an optimized copy:
+
+- resized (Lanczos) to the display width at the target print dpi; an image
+  already narrower is left at its size, so the layout does not change
+- a fully opaque RGBA image is stored as RGB
+- quantized to a 256-colour palette if that is visually lossless (mean
+  absolute error per channel at most MAX_PALETTE_ERROR out of 255), which
+  holds for the flat-colour graph plots; otherwise kept as true colour
+- deduplicated: copies are named by a hash of the source bytes and the
+  settings, so identical figures share one file, and a copy made by an
+  earlier build is reused without re-encoding
+- optionally inlined as a data: URI when the result is small
+
+The markdown keeps pointing at the full-resolution fig_N.png. Copies no
+longer used by the document are deleted (prune()).
+
+report() prints bytes and decoded pixels before and after, and the PNG
+decode time of both versions for the images encoded in this run (Pillow
+decodes the images for weasyprint, so this is the saving on its side).
+
+Usage:
+    optimizer = ImageOptimizer(IMAGE_DIR / 'web', dpi=150, inline_bytes=0)
+    html = optimizer.rewrite_html(html)
+    optimizer.prune()
+    optimizer.report()
+"""
+
+import base64
+import hashlib
+import io
+import re
+import time
+from pathlib import Path
+
+import numpy as np
+
+PRINT_WIDTH_IN = 6.69           # 21 cm A4 width minus two 2 cm page margins
+CSS_DPI = 96                    # never resize below the width the image is shown at on a 1x screen
+MAX_PALETTE_ERROR = 1.0
+_IMG_SRC = re.compile(r'(<img\b[^>]*?\bsrc=")([^"]+)(")')
+
+
+def target_width(dpi, width_in=PRINT_WIDTH_IN):
+    """Pixel width of a full-width image at dpi (at least its CSS pixel width)"""
+    return int(round(width_in * max(dpi, CSS_DPI)))
+
+
+def _decode_seconds(data):
+    from PIL import Image
+
+    t0 = time.perf_counter()
+    Image.open(io.BytesIO(data)).load()
+    return time.perf_counter() - t0
+
+
+def optimize_png(data, max_width):
+    """
+    Optimized PNG bytes for the PNG in data, plus
+    {'pixels_before', 'pixels_after', 'palette', 'decode_before', 'decode_after'}.
+    """
+    from PIL import Image
+
+    t0 = time.perf_counter()
+    im = Image.open(io.BytesIO(data))
+    im.load()
+    decode_before = time.perf_counter() - t0
+    pixels_before = im.width * im.height
+
+    if im.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+        im = im.convert('RGBA' if 'transparency' in im.info or im.mode.endswith('A') else 'RGB')
+    if im.mode == 'RGBA' and im.getextrema()[3][0] == 255:
+        im = im.convert('RGB')
+    if im.width > max_width:
+        im = im.resize((max_width, max(1, round(im.height * max_width / im.width))), Image.LANCZOS)
+
+    out = im
+    palette = False
+    if im.mode in ('RGB', 'RGBA'):
+        method = Image.Quantize.FASTOCTREE if im.mode == 'RGBA' else Image.Quantize.MEDIANCUT
+        quantized = im.quantize(256, method=method, dither=Image.Dither.NONE)
+        error = np.abs(np.asarray(quantized.convert(im.mode), dtype=np.int16)
+                       - np.asarray(im, dtype=np.int16)).mean()
+        if error <= MAX_PALETTE_ERROR:
+            out, palette = quantized, True
+
+    buf = io.BytesIO()
+    out.save(buf, 'PNG')                # optimize=True is 5x slower for about 2% smaller files
+    result = buf.getvalue()
+    if len(result) >= len(data) and im.width * im.height == pixels_before:
+        result = data                   # nothing gained: keep the original
+    return result, {'pixels_before': pixels_before, 'pixels_after': im.width * im.height,
+                    'palette': palette, 'decode_before': decode_before,
+                    'decode_after': _decode_seconds(result)}
+
+
+class ImageOptimizer:
+    """Optimized, deduplicated copies of the document's images in out_dir"""
+
+    def __init__(self, out_dir, dpi=150, inline_bytes=0, width_in=PRINT_WIDTH_IN, base_dir='.'):
+        self.out_dir = Path(out_dir)
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self.base_dir = Path(base_dir)
+        self.max_width = target_width(dpi, width_in)
+        self.inline_bytes = inline_bytes
+        self.settings = f"w={self.max_width};err={MAX_PALETTE_ERROR}".encode('utf-8')
+        self.assets = {}                # digest -> {'path', 'bytes', ...}
+        self.references = 0             # <img> tags rewritten
+        self.used = set()               # output files referenced by the document
+        self.bytes_before = 0
+        self.seconds = 0.0
+
+    def asset(self, src):
+        """(digest, optimized bytes) for the PNG at src; encoded once per distinct content"""
+        data = Path(src).read_bytes()
+        self.bytes_before += len(data)
+        digest = hashlib.sha256(self.settings + b'\0' + data).hexdigest()[:16]
+        if digest not in self.assets:
+            path = self.out_dir / f'{digest}.png'
+            info = {'path': path, 'source_bytes': len(data), 'encoded': False}
+            if path.exists():
+                result = path.read_bytes()
+            else:
+                t0 = time.perf_counter()
+                result, stats = optimize_png(data, self.max_width)
+                self.seconds += time.perf_counter() - t0
+                tmp = path.with_suffix('.tmp')
+                tmp.write_bytes(result)
+                tmp.replace(path)
+                info.update(stats, encoded=True)
+            info['bytes'] = len(result)
+            info['data'] = result
+            self.assets[digest] = info
+        return digest, self.assets[digest]['data']
+
+    def _replacement(self, src):
+        path = self.base_dir / src.replace('\\', '/')
+        if not src.lower().endswith('.png') or '://' in src or src.startswith('data:') or not path.is_file():
+            return None
+        self.references += 1
+        digest, data = self.asset(path)
+        out = self.assets[digest]['path']
+        self.used.add(out.name)
+        if len(data) <= self.inline_bytes:
+            return 'data:image/png;base64,' + base64.b64encode(data).decode('ascii')
+        return out.as_posix()
+
+    def rewrite_html(self, html):
+        """html with every local PNG <img> pointing at its optimized copy (or inlined)"""
+        def swap(match):
+            new = self._replacement(match.group(2))
+            return match.group(0) if new is None else match.group(1) + new + match.group(3)
+        return _IMG_SRC.sub(swap, html)
+
+    def prune(self):
+        """Delete copies this build did not use; returns how many"""
+        removed = 0
+        for path in self.out_dir.glob('*.png'):
+            if path.name not in self.used:
+                path.unlink()
+                removed += 1
+        return removed
+
+    def stats(self):
+        assets = list(self.assets.values())
+        encoded = [a for a in assets if a['encoded']]
+        inlined = sum(1 for a in assets if a['bytes'] <= self.inline_bytes)
+        return {
+            'images': self.references,
+            'distinct': len(assets),
+            'bytes_before': self.bytes_before,
+            'bytes_after': sum(a['bytes'] for a in assets),
+            'inlined': inlined,
+            'encoded': len(encoded),
+            'palette': sum(1 for a in encoded if a['palette']),
+            'pixels_before': sum(a['pixels_before'] for a in encoded),
+            'pixels_after': sum(a['pixels_after'] for a in encoded),
+            'decode_before': sum(a['decode_before'] for a in encoded),
+            'decode_after': sum(a['decode_after'] for a in encoded),
+            'seconds': self.seconds,
+        }
+
+    def report(self):
+        s = self.stats()
+        if not s['images']:
+            return
+        saved = s['bytes_before'] - s['bytes_after']
+        print(f"Images: {s['images']} ({s['distinct']} distinct, {s['inlined']} inlined), "
+              f"{s['bytes_before']:,} -> {s['bytes_after']:,} bytes "
+              f"({100 * saved / max(s['bytes_before'], 1):.0f}% saved)")
+        if s['encoded']:
+            speedup = s['decode_before'] / max(s['decode_after'], 1e-9)
+            print(f"  {s['encoded']} optimized in {s['seconds']:.2f} s ({s['palette']} as palette PNGs): "
+                  f"{s['pixels_before'] / 1e6:.1f} -> {s['pixels_after'] / 1e6:.1f} Mpixel, "
+                  f"PNG decode {s['decode_before']:.3f} -> {s['decode_after']:.3f} s ({speedup:.1f}x)")
+        else:
+            print("  all reused from the previous build")
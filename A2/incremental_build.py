@@ -0,0 +1,96 @@
+"""
+Incremental builds for the assignment document
+
+Each question function gets a fingerprint: a hash of its own source plus the
+code and settings it depends on (helper modules, save_figure, dpi, library
+versions). The build state keeps, per question, the fingerprint, the markdown
+fragment (with job-local figure names), the figure cache keys and the captured
+stdout. A question whose fingerprint is unchanged and whose figures are all
+still in the figure cache is replayed from the state instead of re-executed.
+
+write_if_changed() lets the caller skip rewriting outputs (and re-running
+weasyprint) when the assembled document did not change.
+
+Usage:
+    state = BuildState('.build')
+    fp = question_fingerprint(q3_solution, deps)
+    result = state.replay('q3_solution', fp, cache)   # None -> run it
+"""
+
+import hashlib
+import inspect
+import json
+import types
+from pathlib import Path
+
+STATE_NAME = 'build_state.json'
+
+
+def _dep_source(dep):
+    if isinstance(dep, types.ModuleType):
+        return Path(inspect.getsourcefile(dep)).read_text(encoding='utf-8')
+    if callable(dep):
+        return inspect.getsource(dep)
+    return repr(dep)
+
+
+def question_fingerprint(func, deps=()):
+    """Hash of func's source and of everything in deps (modules, functions or plain values)"""
+    h = hashlib.sha256()
+    for part in [func, *deps]:
+        h.update(_dep_source(part).encode('utf-8'))
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+def write_if_changed(path, text):
+    """Write text to path unless it already holds exactly that; True if the file was written"""
+    path = Path(path)
+    if path.exists() and path.read_text(encoding='utf-8') == text:
+        return False
+    path.write_text(text, encoding='utf-8')
+    return True
+
+
+class BuildState:
+    """Per-question results of the previous build, stored as JSON"""
+
+    def __init__(self, state_dir):
+        self.state_dir = Path(state_dir)
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        self.path = self.state_dir / STATE_NAME
+        self.questions = {}
+        if self.path.exists():
+            with open(self.path, encoding='utf-8') as f:
+                self.questions = json.load(f).get('questions', {})
+
+    def replay(self, name, fingerprint, cache):
+        """
+        Previous result for the question if its fingerprint matches and all of
+        its figures can be restored from the figure cache, else None.
+        Restored figures are copied back to their job-local names.
+        """
+        record = self.questions.get(name)
+        if record is None or record['fingerprint'] != fingerprint:
+            return None
+        keys = record['keys']
+        if cache is None or any(key is None or key not in cache for key in keys):
+            return None
+        paths = [Path(p) for p in record['paths']]
+        for key, path in zip(keys, paths):
+            cache.fetch(key, path)
+        return record['markdown'], paths, keys, record['stdout']
+
+    def record(self, name, fingerprint, result):
+        markdown, paths, keys, stdout = result
+        self.questions[name] = {
+            'fingerprint': fingerprint,
+            'markdown': markdown,
+            'paths': [str(p) for p in paths],
+            'keys': keys,
+            'stdout': stdout,
+        }
+
+    def save(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'questions': self.questions}, f, indent=2, sort_keys=True)
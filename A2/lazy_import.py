@@ -0,0 +1,80 @@
+"""
+Deferred imports and optional-dependency checks for the document build
+
+lazy_import(name) returns a stand-in module that imports the real one on
+the first attribute access, so `nx = lazy_import('networkx')` at the top of
+a script costs nothing until nx.something is used. A build that never draws
+never touches plt and so never imports matplotlib. A top-level module's
+stand-in already knows its file (from the import spec, without executing
+it), so source fingerprints (see incremental_build.py) don't trigger the
+import either.
+
+available() and version() answer "is it installed / which version" from
+the import spec and package metadata: nothing is imported, installed or run
+in a subprocess.
+
+Usage:
+    nx = lazy_import('networkx')
+    plt = lazy_import('matplotlib.pyplot', on_load=lambda plt: plt.ioff())
+    if available('weasyprint'): ...
+    version('matplotlib')                  # '3.8.2', or None if not installed
+"""
+
+import importlib
+import importlib.util
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Stands in for a module and imports it on first attribute access"""
+
+    def __init__(self, name, on_load=None):
+        super().__init__(name)
+        self._lazy_module = None
+        self._lazy_on_load = on_load
+        if '.' not in name:
+            # Locating a submodule would import its package, so only top-level names get a file
+            spec = importlib.util.find_spec(name)
+            if spec is not None and spec.has_location:
+                self.__file__ = spec.origin
+
+    def _load(self):
+        if self._lazy_module is None:
+            module = importlib.import_module(self.__name__)
+            if self._lazy_on_load is not None:
+                self._lazy_on_load(module)
+            self._lazy_module = module
+        return self._lazy_module
+
+    def __getattr__(self, attr):
+        # Only called for names the stand-in itself does not have
+        if attr.startswith('_lazy_'):
+            raise AttributeError(attr)
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = 'loaded' if self._lazy_module is not None else 'not loaded'
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_import(name, on_load=None):
+    """Stand-in for module name (imported on first use, then on_load(module) is called)"""
+    return LazyModule(name, on_load)
+
+
+def available(name):
+    """True if module name can be imported (checked without importing it)"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def version(package):
+    """Installed version of a distribution, or None"""
+    import importlib.metadata       # slow to import, and only needed here
+
+    try:
+        return importlib.metadata.version(package)
+    except importlib.metadata.PackageNotFoundError:
+        return None
@@ -0,0 +1,141 @@
+"""
+Parallel render pipeline for the assignment document
+
+Each question is a job that returns its markdown fragment and saves figures
+through next_figure_path(). Jobs run in a process pool; inside a job, figures
+get job-local temporary names (_q3_fig_1.png, ...). When all jobs are done the
+figures are renamed to fig_1.png, fig_2.png, ... in question order and the
+markdown is rewritten to match, so numbering does not depend on which worker
+finished first.
+
+With build tracing on (see build_trace.py) every job is a span named after
+its question function; jobs in worker processes send their spans back with
+the result.
+
+Usage:
+    fragments = render_questions([q1_solution, q2_solution], IMAGE_DIR)
+"""
+
+import contextlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import build_trace
+from incremental_build import question_fingerprint
+
+# Figure state of the job running in this process (one job at a time per process)
+_job = None
+
+
+class _FigureJob:
+    def __init__(self, index, image_dir):
+        self.index = index
+        self.image_dir = Path(image_dir)
+        self.paths = []
+        self.keys = []
+
+    def next_path(self, key):
+        path = self.image_dir / f'_q{self.index}_fig_{len(self.paths) + 1}.png'
+        self.paths.append(path)
+        self.keys.append(key)
+        return path
+
+
+def next_figure_path(key=None):
+    """Path for the next figure of the running job; key is its figure-cache key, if any"""
+    if _job is None:
+        raise RuntimeError("figures can only be saved inside render_questions()")
+    return _job.next_path(key)
+
+
+def _run_job(index, func, image_dir, trace=False):
+    """(markdown, figure paths, cache keys, stdout) and the spans traced in a worker process"""
+    global _job
+    _job = _FigureJob(index, image_dir)
+    stdout = io.StringIO()
+    try:
+        with build_trace.worker(trace) as spans:
+            with contextlib.redirect_stdout(stdout), build_trace.span(func.__name__, question=index):
+                markdown = func()
+        return (markdown, _job.paths, _job.keys, stdout.getvalue()), spans
+    finally:
+        _job = None
+
+
+def _number_figures(results, image_dir):
+    """
+    Rename job-local figures to fig_1..fig_N in job order and fix up the markdown.
+
+    Returns the fragments and {figure name: cache key} for the figures that have a key.
+    """
+    image_dir = Path(image_dir)
+    fragments = []
+    figure_keys = {}
+    counter = 0
+    for markdown, paths, keys, _ in results:
+        for tmp, key in zip(paths, keys):
+            counter += 1
+            final = image_dir / f'fig_{counter}.png'
+            if key is not None:
+                figure_keys[final.name] = key
+            if tmp.exists():            # a figure skipped by a compute-only build has no file
+                os.replace(tmp, final)
+            for old, new in ((str(tmp), str(final)), (tmp.as_posix(), final.as_posix())):
+                markdown = markdown.replace(old, new)
+        fragments.append(markdown)
+    return fragments, figure_keys
+
+
+def render_questions(funcs, image_dir, workers=None, cache=None, state=None, deps=()):
+    """
+    Run every question function and return their markdown fragments in order.
+
+    workers=None uses one process per CPU (at most one per question);
+    workers=1 runs everything in this process. With a FigureCache, its
+    manifest is rewritten and unused cached figures are evicted at the end.
+    With a BuildState (incremental mode), questions whose fingerprint over
+    their source and deps is unchanged are replayed instead of re-executed.
+    """
+    funcs = list(funcs)
+    results = [None] * len(funcs)
+    fingerprints = {}
+    todo = []
+    for i, func in enumerate(funcs, start=1):
+        if state is not None:
+            fingerprints[i] = question_fingerprint(func, deps)
+            results[i - 1] = state.replay(func.__name__, fingerprints[i], cache)
+            if results[i - 1] is not None:
+                print(f"Question {i} unchanged")
+                continue
+        todo.append(i)
+
+    if workers is None:
+        workers = min(len(todo), os.cpu_count() or 1)
+    trace = build_trace.enabled()
+    if workers <= 1:
+        for i in todo:
+            print(f"Processing Question {i}...")
+            results[i - 1], _ = _run_job(i, funcs[i - 1], image_dir)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {i: pool.submit(_run_job, i, funcs[i - 1], image_dir, trace) for i in todo}
+            for i in todo:
+                results[i - 1], spans = futures[i].result()
+                build_trace.merge(spans)
+                print(f"Question {i} done")
+
+    for i, result in enumerate(results, start=1):
+        if result[3]:
+            print(result[3], end='')
+        if state is not None and i in todo:
+            state.record(funcs[i - 1].__name__, fingerprints[i], result)
+    if state is not None:
+        state.save()
+
+    with build_trace.span('number_figures'):
+        fragments, figure_keys = _number_figures(results, image_dir)
+        if cache is not None:
+            cache.write_manifest(figure_keys)
+    return fragments
@@ -0,0 +1,131 @@
+"""
+Measurement, history and regression checks for the benchmark suite
+
+A kernel is timed on its prepared input (setup is never timed): the best of
+`repeat` runs, with fewer repeats once a single run takes more than a second.
+Peak memory is measured in one extra run under tracemalloc, which sees
+Python and NumPy allocations but slows the run down, so it never affects
+the timings.
+
+Every run is appended to a JSON history. A stored baseline (same format as
+one run) is compared size by size: a kernel is flagged when it got slower or
+bigger by more than the tolerance and by more than a noise floor.
+
+Scaling exponents are least-squares slopes of log(time) against log(n)
+over the sizes whose time is above the noise floor; a slope well above the
+kernel's expected exponent means it drifted, e.g. from O(m) to O(n^2).
+
+Usage:
+    result = measure(run, args, repeat=3)
+    exponent = scaling_exponent(sizes, seconds)
+    flags = compare(run_record, load_json(baseline_path), tolerance=0.25)
+"""
+
+import gc
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+NOISE_SECONDS = 1e-3        # timings below this are dominated by call overhead
+NOISE_BYTES = 1 << 20
+DRIFT = 0.35                # allowed excess over the expected scaling exponent
+
+
+def measure(run, args, repeat=3, memory=True):
+    """{'seconds': best wall time, 'runs': runs timed, 'peak_bytes': traced peak or None}"""
+    best, runs = float('inf'), 0
+    while runs < repeat:
+        gc.collect()
+        t0 = time.perf_counter()
+        run(*args)
+        elapsed = time.perf_counter() - t0
+        best = min(best, elapsed)
+        runs += 1
+        if elapsed > 1.0:
+            break
+    peak = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            run(*args)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return {'seconds': best, 'runs': runs, 'peak_bytes': peak}
+
+
+def scaling_exponent(sizes, seconds):
+    """Slope of log(seconds) over log(size) for timings above the noise floor, or None"""
+    points = [(n, t) for n, t in zip(sizes, seconds) if t >= NOISE_SECONDS and n > 0]
+    if len(points) < 2 or len({n for n, _ in points}) < 2:
+        return None
+    x = np.log([n for n, _ in points])
+    y = np.log([t for _, t in points])
+    return float(np.polyfit(x, y, 1)[0])
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=Path(__file__).parent, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {'commit': commit, 'python': platform.python_version(), 'numpy': np.__version__,
+            'machine': platform.machine(), 'cpus': os.cpu_count()}
+
+
+def load_json(path, default=None):
+    path = Path(path)
+    if not path.exists():
+        return default
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_json(path, data):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def append_history(path, record):
+    history = load_json(path, default=[])
+    history.append(record)
+    save_json(path, history)
+    return len(history)
+
+
+def compare(record, baseline, tolerance=0.25):
+    """
+    Regressions of record against baseline (may be None) as (kernel, size,
+    metric, old, new); exponent drift is reported as (kernel, None,
+    'exponent', expected, measured) with or without a baseline.
+    """
+    flags = []
+    for name, result in record['kernels'].items():
+        old = (baseline or {}).get('kernels', {}).get(name, {'sizes': {}})
+        for size, now in result['sizes'].items():
+            before = old['sizes'].get(size)
+            if not before:
+                continue
+            a, b = before['seconds'], now['seconds']
+            if b > a * (1 + tolerance) and b - a > NOISE_SECONDS:
+                flags.append((name, size, 'seconds', a, b))
+            a, b = before.get('peak_bytes'), now.get('peak_bytes')
+            if a is not None and b is not None and b > a * (1 + tolerance) and b - a > NOISE_BYTES:
+                flags.append((name, size, 'peak_bytes', a, b))
+        expected = result.get('expected_exponent')
+        slope = result.get('exponent')
+        if expected is not None and slope is not None and slope > expected + DRIFT:
+            flags.append((name, None, 'exponent', expected, slope))
+    return flags
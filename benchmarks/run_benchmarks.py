@@ -0,0 +1,313 @@
+"""
+Offline benchmark suite for the graph kernels and the document pipeline
+
+Each kernel has a generator for inputs of size n (random degree sequences,
+products of paths / cycles / complete graphs, synthetic edge-list CSVs, ...)
+and is timed over sizes 10, 100, ... up to its own cap and --max-n. Results
+(time, traced peak memory, scaling exponent) are appended to
+benchmarks/history.json and compared with benchmarks/baseline.json if it
+exists; see harness.py for how regressions are flagged.
+
+Nothing is downloaded or installed: inputs are generated, and the
+generate_pdf benchmark runs the real pipeline (a full and a compute-only
+build) in a temporary directory. The startup benchmark times importing the
+build script in a fresh interpreter and lists the heavy libraries that the
+import pulled in (there should be none, see A2/lazy_import.py).
+
+Usage:
+    python benchmarks/run_benchmarks.py                     # everything up to n = 10^6
+    python benchmarks/run_benchmarks.py --quick             # n <= 10^4, one repeat
+    python benchmarks/run_benchmarks.py --kernels is_bigraphical,graph_from_csv --max-n 100000
+    python benchmarks/run_benchmarks.py --save-baseline     # store this run as the baseline
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT / 'A1'), str(ROOT / 'A2')]
+
+import harness  # noqa: E402
+
+HERE = Path(__file__).resolve().parent
+HISTORY = HERE / 'history.json'
+BASELINE = HERE / 'baseline.json'
+
+# ----------------------------------------------------------------------------
+# Input generators and kernels: setup(n, rng) -> args, run(*args)
+# ----------------------------------------------------------------------------
+
+def _equal_sum_pair(n, rng):
+    """Bi-graphical-sized pair: |S1| = |S2| = n, degrees up to 8, equal sums"""
+    S1 = rng.integers(0, min(8, n) + 1, n)
+    S2 = rng.permutation(S1)
+    return S1.tolist(), S2.tolist()
+
+
+def _graphical_sequence(n, rng):
+    """Degrees of a random simple graph with about 5n edges, so always graphical"""
+    u, v = rng.integers(0, n, 5 * n), rng.integers(0, n, 5 * n)
+    u, v = np.minimum(u, v), np.maximum(u, v)
+    keys = np.unique((u * n + v)[u != v])
+    return np.bincount(np.concatenate((keys // n, keys % n)), minlength=n)
+
+
+def setup_bigraphical(n, rng):
+    return _equal_sum_pair(n, rng)
+
+
+def run_bigraphical(S1, S2):
+    from bigraphical import is_bigraphical
+    return is_bigraphical(S1, S2)
+
+
+def setup_graphical(n, rng):
+    return (_graphical_sequence(n, rng),)
+
+
+def run_graphical(seq):
+    from degree_sequences import is_graphical
+    return is_graphical(seq)
+
+
+def run_havel_hakimi(seq):
+    from degree_sequences import havel_hakimi
+    return havel_hakimi(seq)
+
+
+def _side(n):
+    return max(2, int(round(np.sqrt(n))))
+
+
+def setup_path_cycle(n, rng):
+    from graph_products import cycle_adjacency, path_adjacency
+    s = _side(n)
+    return path_adjacency(s), cycle_adjacency(s)
+
+
+def setup_complete(n, rng):
+    from graph_products import complete_adjacency
+    s = _side(n)
+    return complete_adjacency(s), complete_adjacency(s)
+
+
+def run_product(A, B):
+    from graph_products import product_adjacency
+    return product_adjacency(A, B, 'cartesian')
+
+
+def setup_path_graph(n, rng):
+    import networkx as nx
+    return (nx.path_graph(n),)
+
+
+def run_complement_connected(G):
+    from complement_view import complement_is_connected
+    return complement_is_connected(G)
+
+
+def setup_csv(n, rng):
+    """Synthetic `source,target,weight` CSV with n rows over about n / 4 labels"""
+    labels = max(2, n // 4)
+    src = rng.integers(0, labels, n)
+    dst = rng.integers(0, labels, n)
+    w = rng.integers(1, 10, n)
+    fd, path = tempfile.mkstemp(suffix='.csv', prefix='bench_')
+    with os.fdopen(fd, 'w') as f:
+        f.write('source,target,weight\n')
+        f.writelines(f"v{a},v{b},{c}\n" for a, b, c in zip(src.tolist(), dst.tolist(), w.tolist()))
+    return (path,)
+
+
+def run_graph_from_csv(path):
+    from edge_list_loader import graph_from_csv
+    return graph_from_csv(path)
+
+
+def setup_sparse_graph(n, rng):
+    import scipy.sparse as sp
+    m = 4 * n
+    u, v = rng.integers(0, n, m), rng.integers(0, n, m)
+    return (sp.csr_matrix((np.ones(m, dtype=np.int8), (u, v)), shape=(n, n)),)
+
+
+def run_count_triangles(A):
+    from triangles import count_triangles
+    return count_triangles(A + A.T, method='orient')
+
+
+@contextlib.contextmanager
+def _document_dir():
+    """Temporary working directory for the document pipeline"""
+    old = os.getcwd()
+    work = tempfile.mkdtemp(prefix='bench_doc_')
+    os.chdir(work)
+    try:
+        yield Path(work)
+    finally:
+        os.chdir(old)
+        shutil.rmtree(work, ignore_errors=True)
+
+
+def run_generate_pdf(module, compute_only=False):
+    """One cold build: the figure cache and build state are emptied first"""
+    for path in (Path('assignment_images') / '.cache').glob('*.png'):
+        path.unlink()
+    shutil.rmtree('.build', ignore_errors=True)
+    with contextlib.redirect_stdout(io.StringIO()):
+        module.generate_pdf(workers=1, compute_only=compute_only)
+
+
+# Imported in a fresh interpreter: seconds spent importing the build script, and heavy modules it loaded
+STARTUP_CODE = """
+import sys, time
+t0 = time.perf_counter()
+import generate_assignment_pdf
+print(time.perf_counter() - t0)
+print(','.join(m for m in ('networkx', 'numpy', 'scipy', 'matplotlib', 'markdown', 'weasyprint')
+               if m in sys.modules))
+"""
+
+
+KERNELS = {
+    # name: (setup, run, largest n, expected exponent in n)
+    'is_bigraphical': (setup_bigraphical, run_bigraphical, 10**6, 1.0),
+    'is_graphical': (setup_graphical, run_graphical, 10**6, 1.0),
+    'havel_hakimi': (setup_graphical, run_havel_hakimi, 10**5, 1.0),
+    'cartesian_path_cycle': (setup_path_cycle, run_product, 10**6, 1.0),
+    'cartesian_complete': (setup_complete, run_product, 10**4, 1.5),
+    'complement_is_connected': (setup_path_graph, run_complement_connected, 10**5, 1.0),
+    'graph_from_csv': (setup_csv, run_graph_from_csv, 10**6, 1.0),
+    'count_triangles': (setup_sparse_graph, run_count_triangles, 10**6, 1.0),
+}
+DOCUMENT = 'generate_pdf'
+STARTUP = 'startup'
+
+
+def sizes_up_to(limit):
+    sizes, n = [], 10
+    while n <= limit:
+        sizes.append(n)
+        n *= 10
+    return sizes
+
+
+def bench_kernel(name, max_n, repeat, memory, seed):
+    setup, run, cap, expected = KERNELS[name]
+    result = {'expected_exponent': expected, 'sizes': {}}
+    # Warm-up on a tiny input so module imports are not timed as the n = 10 case
+    args = setup(10, np.random.default_rng(seed))
+    run(*args)
+    if setup is setup_csv:
+        os.unlink(args[0])
+    for n in sizes_up_to(min(cap, max_n)):
+        rng = np.random.default_rng(seed)
+        args = setup(n, rng)
+        try:
+            result['sizes'][str(n)] = harness.measure(run, args, repeat, memory)
+        finally:
+            if setup is setup_csv:
+                os.unlink(args[0])
+        r = result['sizes'][str(n)]
+        peak = '' if r['peak_bytes'] is None else f", peak {r['peak_bytes'] / 2**20:.1f} MiB"
+        print(f"  {name:26s} n = {n:>8d}: {1e3 * r['seconds']:10.3f} ms{peak}", flush=True)
+    sizes = [int(n) for n in result['sizes']]
+    result['exponent'] = harness.scaling_exponent(sizes, [result['sizes'][str(n)]['seconds'] for n in sizes])
+    return result
+
+
+def bench_document(repeat, memory):
+    """Cold full build and cold compute-only build (markdown, no figures)"""
+    sizes = {}
+    with _document_dir():
+        # Imported inside the work directory: its image and cache paths are relative
+        with contextlib.redirect_stdout(io.StringIO()):
+            import generate_assignment_pdf as module
+        for label, compute_only in (('document', False), ('compute_only', True)):
+            r = sizes[label] = harness.measure(run_generate_pdf, (module, compute_only), repeat, memory)
+            peak = '' if r['peak_bytes'] is None else f", peak {r['peak_bytes'] / 2**20:.1f} MiB"
+            print(f"  {DOCUMENT:26s} {label:>12s}: {r['seconds']:.2f} s{peak}", flush=True)
+    return {'expected_exponent': None, 'exponent': None, 'sizes': sizes}
+
+
+def bench_startup(repeat):
+    """Import time of generate_assignment_pdf in a fresh interpreter (best of repeat)"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(ROOT / 'A2'), os.environ.get('PYTHONPATH', '')]))
+    best, loaded = float('inf'), ''
+    with _document_dir() as work:
+        for _ in range(max(repeat, 3)):
+            out = subprocess.run([sys.executable, '-c', STARTUP_CODE], cwd=work, env=env,
+                                 capture_output=True, text=True, check=True).stdout.split('\n')
+            best, loaded = min(best, float(out[0])), out[1]
+    print(f"  {STARTUP:26s} import: {1e3 * best:.0f} ms, heavy modules loaded: {loaded or 'none'}",
+          flush=True)
+    r = {'seconds': best, 'runs': max(repeat, 3), 'peak_bytes': None, 'modules': loaded.split(',') if loaded else []}
+    return {'expected_exponent': None, 'exponent': None, 'sizes': {'import': r}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the graph kernels and generate_pdf()")
+    parser.add_argument('--kernels', help=f"comma-separated subset of {', '.join(list(KERNELS) + [STARTUP, DOCUMENT])}")
+    parser.add_argument('--max-n', type=int, default=10**6)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help="skip the traced peak-memory run")
+    parser.add_argument('--quick', action='store_true', help="n <= 10^4 and one repeat")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed slowdown against the baseline")
+    parser.add_argument('--history', default=str(HISTORY))
+    parser.add_argument('--baseline', default=str(BASELINE))
+    parser.add_argument('--save-baseline', action='store_true')
+    args = parser.parse_args()
+    if args.quick:
+        args.max_n, args.repeat = min(args.max_n, 10**4), 1
+
+    names = args.kernels.split(',') if args.kernels else list(KERNELS) + [STARTUP, DOCUMENT]
+    unknown = [k for k in names if k not in KERNELS and k not in (STARTUP, DOCUMENT)]
+    if unknown:
+        parser.error(f"unknown kernels: {', '.join(unknown)}")
+
+    record = {'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'env': harness.environment(),
+              'max_n': args.max_n, 'kernels': {}}
+    memory = not args.no_memory
+    for name in names:
+        if name == DOCUMENT:
+            record['kernels'][name] = bench_document(args.repeat, memory)
+        elif name == STARTUP:
+            record['kernels'][name] = bench_startup(args.repeat)
+        else:
+            record['kernels'][name] = bench_kernel(name, args.max_n, args.repeat, memory, args.seed)
+
+    print("\nScaling exponents (time ~ n^k):")
+    for name, result in record['kernels'].items():
+        if result['exponent'] is not None:
+            print(f"  {name:26s} k = {result['exponent']:.2f} (expected {result['expected_exponent']})")
+
+    count = harness.append_history(args.history, record)
+    print(f"\nRun {count} appended to {args.history}")
+    baseline = harness.load_json(args.baseline)
+    flags = harness.compare(record, baseline, args.tolerance)
+    if baseline is None:
+        print(f"No baseline at {args.baseline} (store one with --save-baseline)")
+    for name, size, metric, old, new in flags:
+        where = f"n = {size}" if size is not None else "scaling"
+        print(f"  REGRESSION {name} {where}: {metric} {old:.4g} -> {new:.4g}")
+    if baseline is not None and not flags:
+        print("No regressions against the baseline")
+    if args.save_baseline:
+        harness.save_json(args.baseline, record)
+        print(f"Baseline saved to {args.baseline}")
+    return 1 if flags else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())